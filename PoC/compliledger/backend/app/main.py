@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
 import sys
+import asyncio
 from pathlib import Path
 
 # Add proper import paths
@@ -32,6 +33,7 @@ app.add_middleware(
 
 # Import API routers (package-relative)
 from .api.routes import artifacts, verification, auditor, controls, ipfs
+from compliledger.contracts.contract_integration import warm_algod_connection
 
 # Include API routers
 app.include_router(artifacts.router, prefix="/api/v1/artifacts", tags=["artifacts"])
@@ -40,6 +42,11 @@ app.include_router(auditor.router, prefix="/api/v1/auditor", tags=["auditor"])
 app.include_router(controls.router, prefix="/api/v1/controls", tags=["controls"])
 app.include_router(ipfs.router, prefix="/api/v1/ipfs", tags=["ipfs"])
 
+@app.on_event("startup")
+async def warm_up_algod():
+    """Open the algod connection and fetch suggested params before the first request"""
+    await asyncio.to_thread(warm_algod_connection)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
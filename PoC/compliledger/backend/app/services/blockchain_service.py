@@ -6,12 +6,15 @@ from algosdk import account, mnemonic
 from algosdk.v2client import algod
 # Update import for Algorand SDK v2.0.0
 from algosdk.transaction import PaymentTxn, ApplicationCallTxn
-from algosdk.encoding import decode_address
+from algosdk.encoding import decode_address, checksum
 import base64
 
 # Load environment variables
 load_dotenv()
 
+# SBOM Registry dispatches on 4-byte method selectors (see contracts/sbom_registry.py)
+SUBMIT_VERIFICATION = checksum(b"submit_verification(byte[32],byte[])void")[:4]
+
 class AlgorandService:
     """
     Service for interacting with Algorand blockchain and smart contracts
@@ -112,7 +115,7 @@ class AlgorandService:
 
             # Create application call transaction
             app_args = [
-                b"submit_verification",
+                SUBMIT_VERIFICATION,
                 artifact_hash_bytes,
                 profile_id_bytes
             ]
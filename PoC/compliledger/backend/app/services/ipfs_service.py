@@ -1,5 +1,6 @@
 import os
 import json
+import contextlib
 import httpx
 import time
 from datetime import datetime
@@ -14,8 +15,14 @@ class IPFSService:
     Service for pinning documents to IPFS using Pinata
     """
     
-    def __init__(self):
-        """Initialize IPFS service with API credentials"""
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize IPFS service with API credentials
+        
+        Pass http_client to share one keep-alive connection pool with other
+        services; the caller owns it and closes it. Without one, each request
+        opens (and closes) its own client.
+        """
+        self.http_client = http_client
         self.api_key = os.getenv("PINATA_API_KEY")
         self.api_secret = os.getenv("PINATA_API_SECRET")
         
@@ -29,6 +36,15 @@ class IPFSService:
             "pinata_secret_api_key": self.api_secret,
         }
     
+    @contextlib.asynccontextmanager
+    async def _client(self):
+        """The shared http_client if one was given, else a one-off client"""
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+    
     async def pin_json(self, data: Any, name: str, artifact_hash: str) -> Dict[str, str]:
         """
         Pin JSON data to IPFS
@@ -56,7 +72,7 @@ class IPFSService:
             }
             
             # Make API request
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(
                     f"{self.base_url}/pinning/pinJSONToIPFS",
                     headers={**self.base_headers, "Content-Type": "application/json"},
@@ -130,7 +146,7 @@ class IPFSService:
                 # You may pass pinataOptions if needed
             }
 
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(
                     f"{self.base_url}/pinning/pinFileToIPFS",
                     headers=self.base_headers,
@@ -155,6 +171,63 @@ class IPFSService:
                 "ipfs_url": f"https://gateway.pinata.cloud/ipfs/mock-ipfs-file-{mock_hash}",
             }
     
+    async def pin_bytes(self, payload: bytes, name: str, artifact_hash: str) -> Dict[str, str]:
+        """
+        Pin an already-serialized JSON document to IPFS
+        
+        Same pinJSONToIPFS pin as pin_json, but the caller encodes the document
+        (e.g. with orjson) and the bytes are spliced into the request body
+        as-is, without another json round trip.
+        
+        Args:
+            payload: Encoded JSON document
+            name: Name for the pin
+            artifact_hash: Hash of the artifact for metadata
+            
+        Returns:
+            Dictionary with IPFS hash (CID) and URL
+        """
+        try:
+            metadata = {
+                "name": name,
+                "keyvalues": {
+                    "artifactHash": artifact_hash,
+                    "service": "compliledger",
+                    "timestamp": str(int(datetime.now().timestamp()))
+                }
+            }
+            # Same envelope pin_json sends, with pinataContent pre-encoded
+            body = b'{"pinataContent":' + payload + b',"pinataMetadata":' + json.dumps(metadata).encode() + b'}'
+            
+            async with self._client() as client:
+                response = await client.post(
+                    f"{self.base_url}/pinning/pinJSONToIPFS",
+                    headers={**self.base_headers, "Content-Type": "application/json"},
+                    content=body
+                )
+                
+                if response.status_code != 200:
+                    raise Exception(f"Failed to pin to IPFS: {response.text}")
+                
+                result = response.json()
+                
+                return {
+                    "ipfs_cid": result["IpfsHash"],
+                    "ipfs_url": f"https://gateway.pinata.cloud/ipfs/{result['IpfsHash']}"
+                }
+                
+        except Exception as e:
+            # For PoC purposes, return mock data on failure (same CIDs as pin_json)
+            import hashlib
+            mock_hash = hashlib.sha256(f"{name}-{artifact_hash}".encode()).hexdigest()[:16]
+            
+            print(f"IPFS pinning error (returning mock CID): {str(e)}")
+            
+            return {
+                "ipfs_cid": f"mock-ipfs-{mock_hash}",
+                "ipfs_url": f"https://gateway.pinata.cloud/ipfs/mock-ipfs-{mock_hash}"
+            }
+    
     async def pin_directory(self, files: Dict[str, Any], dir_name: str, artifact_hash: str) -> Dict[str, str]:
         """
         Pin multiple files as a directory to IPFS
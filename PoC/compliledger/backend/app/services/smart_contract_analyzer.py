@@ -1,4 +1,6 @@
 import re
+import json
+import hashlib
 from typing import Any, Dict, List
 
 
@@ -75,7 +77,7 @@ class SmartContractAnalyzer:
         controls_failed = len([f for f in findings if f["severity"] in ("high", "medium")])
         controls_passed = 10 + max(0, functions - controls_failed)  # rough placeholder
 
-        return {
+        result = {
             "findings": findings,
             "metrics": {
                 "sloc": sloc,
@@ -86,6 +88,9 @@ class SmartContractAnalyzer:
             "controls_failed": controls_failed,
             "findings_count": len(findings),
         }
+        # Identifies this analysis on chain and in the integration service's result cache
+        result["result_hash"] = hashlib.sha256(json.dumps(result, sort_keys=True).encode()).hexdigest()
+        return result
 
     def _map_to_controls(self, rule_id: str) -> List[str]:
         # Minimal mapping to generic NIST-like tags
@@ -24,7 +24,7 @@ DEFAULT_ALGOD_URL = os.getenv("ALGORAND_API_URL", "https://testnet-api.algonode.
 
 PROFILE_MAX = 64
 OSCAL_MAX = 64
-TOTAL_SIZE = 200
+TOTAL_SIZE = 184
 
 
 def get_client(algod_url: str) -> algod.AlgodClient:
@@ -59,12 +59,14 @@ def read_box(algod_client: algod.AlgodClient, app_id: int, artifact_hash_hex: st
     submitter_addr = algo_enc.encode_address(submitter_pk)
     submitted_at = u64(raw[40:48])
     verified_at = u64(raw[48:56])
-    profile_len = u64(raw[56:64])
-    profile_bytes = raw[64:64+profile_len]
-
-    # OSCAL section starts at 128
-    oscal_len = u64(raw[128:136])
-    oscal_cid = raw[136:136+oscal_len].decode(errors="ignore")
+    # Fixed-width, zero-padded fields (no length prefix): strip the padding
+    profile_bytes = raw[56:56+PROFILE_MAX].rstrip(b"\0")
+    profile_len = len(profile_bytes)
+
+    # OSCAL section starts at 120
+    oscal_bytes = raw[120:120+OSCAL_MAX].rstrip(b"\0")
+    oscal_len = len(oscal_bytes)
+    oscal_cid = oscal_bytes.decode(errors="ignore")
 
     return {
         "status": status,
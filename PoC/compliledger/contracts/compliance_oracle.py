@@ -1,4 +1,9 @@
 from pyteal import *
+try:
+    from .teal_files import write_if_changed
+except ImportError:
+    # Run as a script from contracts/
+    from teal_files import write_if_changed
 
 """
 ComplianceOracle Smart Contract
@@ -71,7 +76,8 @@ def compliance_oracle():
                 (Int(0), artifact_hash)
             ],
             TxnField.application_args: [
-                Bytes("update_verification"),
+                # Registry dispatches on the 4-byte selector (see sbom_registry.py)
+                MethodSignature("update_verification(byte[32],byte[],uint64)void"),
                 artifact_hash,
                 oscal_cid,
                 Itob(verification_status)
@@ -100,14 +106,12 @@ def clear_state_program():
 def compile_contract():
     """Compile the contract to TEAL files"""
     # Compile the approval program
-    with open("CompliLedger_ComplianceOracle_approval.teal", "w") as f:
-        compiled = compileTeal(compliance_oracle(), Mode.Application, version=8)
-        f.write(compiled)
+    compiled = compileTeal(compliance_oracle(), Mode.Application, version=8)
+    write_if_changed("CompliLedger_ComplianceOracle_approval.teal", compiled)
     
     # Compile the clear state program
-    with open("CompliLedger_ComplianceOracle_clear.teal", "w") as f:
-        compiled = compileTeal(clear_state_program(), Mode.Application, version=8)
-        f.write(compiled)
+    compiled = compileTeal(clear_state_program(), Mode.Application, version=8)
+    write_if_changed("CompliLedger_ComplianceOracle_clear.teal", compiled)
     
     print("CompliLedger Compliance Oracle contract compiled to TEAL (v8)")
 
@@ -1,12 +1,350 @@
 #!/usr/bin/env python3
 
 import base64
+import binascii
 from algosdk.v2client import algod
 from algosdk import account, mnemonic, transaction
 from algosdk.transaction import ApplicationCreateTxn, ApplicationCallTxn, ApplicationOptInTxn
 from algosdk import encoding as algo_encoding
+from algosdk import constants
+from algosdk.error import AlgodHTTPError, AlgodResponseError
+import copy
+import functools
 import time
 import json
+import logging
+import threading
+import weakref
+import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib import parse
+import httpx
+import certifi
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Connection pool bounds for algod traffic: a handful of keep-alive
+# sockets covers the concurrent sends/compiles a process issues
+ALGOD_POOL_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+# Connect-level retries (refused/reset sockets) before an RPC is surfaced as failed
+ALGOD_CONNECT_RETRIES = 3
+
+
+def _hex_bytes(value):
+    """Decode a hex digest to raw bytes (bytes pass through unchanged)"""
+    if isinstance(value, (bytes, bytearray)):
+        return value
+    return binascii.unhexlify(value)
+
+
+# Big-endian uint64 encodings of the verification statuses (0/1/2), which
+# also cover the usual small control counts
+_STATUS_BYTES = {i: i.to_bytes(8, byteorder='big') for i in range(3)}
+
+
+def _uint64(value):
+    """Encode an app arg as 8 big-endian bytes, reusing the precomputed small values"""
+    return _STATUS_BYTES.get(value) or value.to_bytes(8, byteorder='big')
+
+
+def method_selector(signature):
+    """ARC-4 style method selector: first 4 bytes of SHA-512/256 of the signature"""
+    return algo_encoding.checksum(signature.encode())[:4]
+
+
+# SBOM Registry selectors, sent as app arg 0 (signatures must match sbom_registry.py)
+SET_ORACLE = method_selector("set_oracle(address)void")
+SUBMIT_VERIFICATION = method_selector("submit_verification(byte[32],byte[])void")
+UPDATE_VERIFICATION = method_selector("update_verification(byte[32],byte[],uint64)void")
+QUERY_VERIFICATION = method_selector("query_verification(byte[32])void")
+
+
+# Genesis/fee data plus the newest round seen, per algod client. Transactions
+# are built from this instead of a suggested_params round trip each time.
+_PARAMS_CACHE = weakref.WeakKeyDictionary()
+_PARAMS_LOCK = threading.Lock()
+# Refetch from algod when no round has been observed for this many seconds
+PARAMS_MAX_AGE = 60
+# Rounds a transaction stays valid for (same window algod suggests)
+VALIDITY_WINDOW = 1000
+
+
+def cached_suggested_params(algod_client):
+    """Return a fresh SuggestedParams built from cached network constants.
+    
+    genesis hash/id and fees only change on protocol upgrades, so they are
+    fetched once; the round window is derived from the last round recorded
+    via record_round (or the initial fetch).
+    """
+    with _PARAMS_LOCK:
+        entry = _PARAMS_CACHE.get(algod_client)
+        stale = entry is None or time.monotonic() - entry["seen_at"] > PARAMS_MAX_AGE
+    if stale:
+        sp = algod_client.suggested_params()
+        entry = {
+            "fee": sp.fee,
+            "min_fee": sp.min_fee,
+            "gh": sp.gh,
+            "gen": sp.gen,
+            "consensus_version": sp.consensus_version,
+            "last_round": sp.first,
+            "seen_at": time.monotonic(),
+        }
+        with _PARAMS_LOCK:
+            _PARAMS_CACHE[algod_client] = entry
+    first = entry["last_round"]
+    return transaction.SuggestedParams(
+        fee=entry["fee"],
+        first=first,
+        last=first + VALIDITY_WINDOW,
+        gh=entry["gh"],
+        gen=entry["gen"],
+        consensus_version=entry["consensus_version"],
+        min_fee=entry["min_fee"],
+    )
+
+
+def record_round(algod_client, last_round):
+    """Note a round reported by algod (status / status_after_block) for cached params"""
+    with _PARAMS_LOCK:
+        entry = _PARAMS_CACHE.get(algod_client)
+        if entry is not None and last_round >= entry["last_round"]:
+            entry["last_round"] = last_round
+            entry["seen_at"] = time.monotonic()
+
+
+# Attempts per submission before giving up; retries reuse the cached signed bytes
+SEND_RETRIES = 3
+
+
+def _send_signed(algod_client, signed_cache, signed_txn, retries=SEND_RETRIES):
+    """Send a signed transaction via send_raw_transaction.
+    
+    The msgpack encoding is cached by txid so a resend after a dropped
+    submission (e.g. a full broadcast queue) reuses it instead of re-signing.
+    """
+    txid = signed_txn.get_txid()
+    if txid not in signed_cache:
+        signed_cache[txid] = (
+            algo_encoding.msgpack_encode(signed_txn),
+            signed_txn.transaction.last_valid_round,
+        )
+    raw = signed_cache[txid][0]
+    try:
+        for attempt in range(retries):
+            try:
+                return algod_client.send_raw_transaction(raw)
+            except AlgodHTTPError as e:
+                if "already in ledger" in str(e):
+                    # An earlier attempt went through even though we saw an error
+                    return txid
+                # Rejections (bad program, overspend, ...) will not pass on retry
+                if (e.code is not None and 400 <= e.code < 500) or attempt == retries - 1:
+                    raise
+            except Exception:
+                if attempt == retries - 1:
+                    raise
+            time.sleep(0.5 * 2 ** attempt)
+    except Exception:
+        # Given up (rejection, timeout, reset, ...): later calls must not reuse these bytes
+        signed_cache.pop(txid, None)
+        raise
+
+
+def _evict_signed(signed_cache, txid, current_round):
+    """Drop a confirmed txid plus any cached transaction past its validity window"""
+    signed_cache.pop(txid, None)
+    expired = [t for t, (_, last_valid) in signed_cache.items() if last_valid < current_round]
+    for t in expired:
+        signed_cache.pop(t, None)
+
+
+class ConfirmationDispatcher:
+    """Shared block watcher for every client on one algod connection.
+    
+    One background thread waits for each new block with a single
+    status_after_block call and then checks every pending txid, so the
+    number of waits algod sees per block stays constant however many
+    transactions (or client instances) are waiting. register() returns a
+    concurrent.futures.Future; async callers can await it via
+    asyncio.wrap_future.
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, algod_client):
+        # Weak reference so the registry above does not keep the client alive
+        self._client_ref = weakref.ref(algod_client)
+        # txid -> [future, timeout in rounds, deadline round (set on first check)]
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @classmethod
+    def for_client(cls, algod_client):
+        """Return the dispatcher shared by everything using this algod client"""
+        with cls._instances_lock:
+            dispatcher = cls._instances.get(algod_client)
+            if dispatcher is None:
+                dispatcher = cls._instances[algod_client] = cls(algod_client)
+            return dispatcher
+
+    def register(self, txid, timeout=20):
+        """Start watching txid; the future resolves to its pending_transaction_info"""
+        return self.register_many([txid], timeout)[txid]
+
+    def register_many(self, txids, timeout=20):
+        """Start watching several txids at once (same round); returns {txid: future}"""
+        futures = {}
+        with self._lock:
+            for txid in txids:
+                if txid not in self.pending:
+                    self.pending[txid] = [Future(), timeout, None]
+                futures[txid] = self.pending[txid][0]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="algod-confirmations", daemon=True)
+                self._thread.start()
+        return futures
+
+    def wait(self, txid, timeout=20):
+        """Block until txid confirms (or fails / times out)"""
+        return self.register(txid, timeout).result()
+
+    def _resolve(self, txid, result=None, exc=None):
+        with self._lock:
+            entry = self.pending.pop(txid, None)
+        if entry is None:
+            return
+        if exc is not None:
+            entry[0].set_exception(exc)
+        else:
+            entry[0].set_result(result)
+
+    def _check(self, algod_client, txid, current_round):
+        try:
+            pending_txn = algod_client.pending_transaction_info(txid)
+        except Exception:
+            self._resolve(txid, {"confirmed-round": 0, "pool-error": "Transaction not found"})
+            return
+
+        if pending_txn.get("confirmed-round", 0) > 0:
+            self._resolve(txid, pending_txn)
+        elif pending_txn.get("pool-error"):
+            # Try to attach any logs for easier debugging
+            logs = pending_txn.get("logs") or []
+            try:
+                decoded_logs = [base64.b64decode(l).decode(errors="ignore") for l in logs]
+            except Exception:
+                decoded_logs = []
+            self._resolve(txid, exc=Exception(f"Pool error: {pending_txn['pool-error']} | logs: {decoded_logs}"))
+        else:
+            with self._lock:
+                entry = self.pending.get(txid)
+                if entry is not None and entry[2] is None:
+                    entry[2] = current_round + entry[1]
+                expired = entry is not None and current_round >= entry[2]
+            if expired:
+                self._resolve(txid, exc=Exception(f"Transaction {txid} not confirmed after {entry[1]} rounds"))
+
+    def _run(self):
+        algod_client = self._client_ref()
+        try:
+            current_round = algod_client.status()["last-round"]
+            record_round(algod_client, current_round)
+            while True:
+                with self._lock:
+                    txids = list(self.pending)
+                for txid in txids:
+                    self._check(algod_client, txid, current_round)
+                with self._lock:
+                    if not self.pending:
+                        self._thread = None
+                        return
+                # One wait per block for all pending transactions; resume from
+                # the round the node reports in case it woke us late
+                status = algod_client.status_after_block(current_round)
+                current_round = status["last-round"]
+                record_round(algod_client, current_round)
+        except Exception as e:
+            with self._lock:
+                pending, self.pending = self.pending, {}
+                self._thread = None
+            for future, _, _ in pending.values():
+                future.set_exception(e)
+
+
+class PooledAlgodClient(algod.AlgodClient):
+    """AlgodClient that sends every request over one pooled httpx.Client.
+    
+    The stock client opens a fresh urllib connection (TCP + TLS handshake)
+    per RPC. This keeps connections alive between calls and, when the h2
+    package is installed, multiplexes concurrent requests (e.g. parallel
+    TEAL compiles) over a single HTTP/2 connection.
+    """
+
+    def __init__(self, algod_token, algod_address, headers=None, http_client=None):
+        super().__init__(algod_token, algod_address, headers)
+        if http_client is None:
+            # Pool settings live on the transport so it can also retry connects
+            http_client = httpx.Client(
+                transport=httpx.HTTPTransport(
+                    http2=HTTP2_AVAILABLE,
+                    verify=certifi.where(),
+                    limits=ALGOD_POOL_LIMITS,
+                    retries=ALGOD_CONNECT_RETRIES,
+                ),
+                # status_after_block long-polls for up to a minute server-side
+                timeout=httpx.Timeout(30.0, read=90.0),
+            )
+        self.http_client = http_client
+
+    def algod_request(self, method, requrl, params=None, data=None, headers=None, response_format="json"):
+        """Same contract as AlgodClient.algod_request, over the pooled connection"""
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header.update({constants.algod_auth_header: self.algod_token})
+
+        if requrl not in constants.unversioned_paths:
+            requrl = algod.api_version_path_prefix + requrl
+        if params:
+            requrl = requrl + "?" + parse.urlencode(params)
+
+        resp = self.http_client.request(method, self.algod_address + requrl, headers=header, content=data)
+        if resp.status_code >= 400:
+            try:
+                message = resp.json()["message"]
+            except Exception:
+                message = resp.text
+            raise AlgodHTTPError(message, resp.status_code)
+
+        if response_format == "json":
+            # Some algod responses are a 200 OK with an empty body
+            if not resp.content:
+                return {}
+            try:
+                return resp.json()
+            except ValueError as e:
+                raise AlgodResponseError("Failed to parse JSON response from algod") from e
+        return resp.content
+
+
+@functools.lru_cache(maxsize=None)
+def shared_algod_client(algod_address, algod_token=""):
+    """Return the process-wide PooledAlgodClient for a node.
+    
+    Pass the same instance to SBOMRegistryClient and ComplianceOracleClient
+    so both reuse one keep-alive connection pool (and share the cached
+    params and confirmation dispatcher) instead of each opening their own.
+    """
+    return PooledAlgodClient(algod_token, algod_address)
+
 
 class SBOMRegistryClient:
     def __init__(self, algod_client, private_key, app_id=None):
@@ -15,51 +353,45 @@ class SBOMRegistryClient:
         self.private_key = private_key
         self.address = account.address_from_private_key(private_key)
         self.app_id = app_id
+        # txid -> (msgpack-encoded signed txn, last valid round), kept until confirmed
+        self._signed_cache = {}
     
     def compile_program(self, source_code):
         """Compile TEAL source code to binary"""
         compile_response = self.algod_client.compile(source_code)
         return base64.b64decode(compile_response['result'])
     
+    def send_signed(self, signed_txn):
+        """Submit a signed transaction, resending the cached bytes on transient failures"""
+        return _send_signed(self.algod_client, self._signed_cache, signed_txn)
+    
     def wait_for_confirmation(self, txid, timeout=20):
         """Wait for transaction confirmation"""
-        start_round = self.algod_client.status()["last-round"] + 1
-        current_round = start_round
-
-        while current_round < start_round + timeout:
-            try:
-                pending_txn = self.algod_client.pending_transaction_info(txid)
-            except Exception:
-                return {"confirmed-round": 0, "pool-error": "Transaction not found"}
-            
-            if pending_txn.get("confirmed-round", 0) > 0:
-                return pending_txn
-            
-            if pending_txn.get("pool-error"):
-                # Try to attach any logs for easier debugging
-                logs = pending_txn.get("logs") or []
-                try:
-                    import base64 as _b64
-                    decoded_logs = [ _b64.b64decode(l).decode(errors="ignore") for l in logs ]
-                except Exception:
-                    decoded_logs = []
-                raise Exception(f"Pool error: {pending_txn['pool-error']} | logs: {decoded_logs}")
-            
-            self.algod_client.status_after_block(current_round)
-            current_round += 1
-            
-        raise Exception(f"Transaction {txid} not confirmed after {timeout} rounds")
+        confirmed_txn = ConfirmationDispatcher.for_client(self.algod_client).wait(txid, timeout)
+        _evict_signed(self._signed_cache, txid, confirmed_txn.get("confirmed-round", 0))
+        return confirmed_txn
+    
+    def wait_for_confirmations(self, txids, timeout=20):
+        """Wait for several transactions at once. Returns {txid: confirmed_txn}.
+        All txids are handed to the shared dispatcher, so the whole batch
+        costs one status_after_block per round.
+        """
+        dispatcher = ConfirmationDispatcher.for_client(self.algod_client)
+        futures = dispatcher.register_many(dict.fromkeys(txids), timeout)
+        confirmed = {}
+        for txid, future in futures.items():
+            confirmed[txid] = future.result()
+            _evict_signed(self._signed_cache, txid, confirmed[txid].get("confirmed-round", 0))
+        return confirmed
     
     def deploy_contract(self, approval_source, clear_source):
         """Deploy the SBOM Registry contract"""
-        print("Deploying SBOM Registry contract...")
-        
-        # Compile programs
-        approval_program = self.compile_program(approval_source)
-        clear_program = self.compile_program(clear_source)
+        # Compile programs (independent RPCs, so run them concurrently)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            approval_program, clear_program = pool.map(self.compile_program, (approval_source, clear_source))
         
         # Get network params
-        params = self.algod_client.suggested_params()
+        params = cached_suggested_params(self.algod_client)
         # Box ops require higher fee; use flat fee
         params.flat_fee = True
         try:
@@ -89,51 +421,53 @@ class SBOMRegistryClient:
         
         # Sign and send transaction
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
         self.app_id = confirmed_txn["application-index"]
         
-        print(f"Contract deployed! App ID: {self.app_id}")
+        logger.info("SBOM Registry deployed: app_id=%s tx_id=%s", self.app_id, tx_id)
         return self.app_id
     
-    def set_oracle(self, oracle_address):
-        """Set the oracle address for the SBOM Registry contract.
+    def make_set_oracle_txn(self, oracle_address, params=None):
+        """Build (but do not sign) the set_oracle call.
         Accepts a base32 Algorand address string or 32-byte public key bytes.
         """
         if isinstance(oracle_address, str):
             oracle_address_bytes = algo_encoding.decode_address(oracle_address)
         else:
             oracle_address_bytes = oracle_address
-        print("Setting oracle address to:", algo_encoding.encode_address(oracle_address_bytes))
-        
-        params = self.algod_client.suggested_params()
-        
-        # Create application call transaction
-        txn = ApplicationCallTxn(
+        if params is None:
+            params = cached_suggested_params(self.algod_client)
+        return ApplicationCallTxn(
             sender=self.address,
             sp=params,
             index=self.app_id,
             on_complete=transaction.OnComplete.NoOpOC,
-            app_args=[b"set_oracle", oracle_address_bytes]
+            app_args=[SET_ORACLE, oracle_address_bytes]
         )
+    
+    def set_oracle(self, oracle_address):
+        """Set the oracle address for the SBOM Registry contract.
+        Accepts a base32 Algorand address string or 32-byte public key bytes.
+        """
+        # Create application call transaction
+        txn = self.make_set_oracle_txn(oracle_address)
         
         # Sign and send
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
-        print(f"Oracle address set successfully")
+        logger.info("Oracle address set: oracle=%s tx_id=%s", algo_encoding.encode_address(txn.app_args[1]), tx_id)
         return confirmed_txn
 
-    def update_verification(self, artifact_hash, status:int, oscal_cid:str):
-        """Oracle-only update of verification record in box.
-        Caller must be set as oracle in registry contract.
-        """
-        print(f"Updating verification for {artifact_hash} to status={status}, oscal_cid={oscal_cid}")
-        params = self.algod_client.suggested_params()
+    def make_update_verification_txn(self, artifact_hash, status:int, oscal_cid:str, params=None):
+        """Build (but do not sign) the update_verification call for an artifact"""
+        if params is None:
+            params = cached_suggested_params(self.algod_client)
         # Ensure sufficient fee for box replace operations
         params.flat_fee = True
         try:
@@ -141,31 +475,37 @@ class SBOMRegistryClient:
             params.fee = max(min_fee * 10, 10000)
         except Exception:
             params.fee = 10000
-        box_name = bytes.fromhex(artifact_hash) if not isinstance(artifact_hash, bytes) else artifact_hash
-        txn = ApplicationCallTxn(
+        box_name = _hex_bytes(artifact_hash)
+        return ApplicationCallTxn(
             sender=self.address,
             sp=params,
             index=self.app_id,
             on_complete=transaction.OnComplete.NoOpOC,
             app_args=[
-                b"update_verification",
+                UPDATE_VERIFICATION,
                 box_name,
                 oscal_cid.encode(),
-                status.to_bytes(8, byteorder='big')
+                _uint64(status)
             ],
             boxes=[(0, box_name)]
         )
+    
+    def update_verification(self, artifact_hash, status:int, oscal_cid:str, sp=None):
+        """Oracle-only update of verification record in box.
+        Caller must be set as oracle in registry contract.
+        Pass sp to reuse suggested params already fetched by the caller.
+        """
+        txn = self.make_update_verification_txn(artifact_hash, status, oscal_cid, copy.copy(sp) if sp is not None else None)
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         confirmed_txn = self.wait_for_confirmation(tx_id)
-        print("Update submitted successfully")
+        logger.info("Verification updated: artifact=%s status=%s oscal_cid=%s tx_id=%s", artifact_hash, status, oscal_cid, tx_id)
         return {"tx_id": tx_id, "confirmation": confirmed_txn}
     
-    def register_artifact(self, artifact_hash, profile_id="default"):
-        """Register an artifact for verification"""
-        print(f"Registering artifact with hash: {artifact_hash}")
-        
-        params = self.algod_client.suggested_params()
+    def make_register_artifact_txn(self, artifact_hash, profile_id="default", params=None):
+        """Build (but do not sign) the submit_verification call for an artifact"""
+        if params is None:
+            params = cached_suggested_params(self.algod_client)
         # Ensure sufficient fee for box create
         params.flat_fee = True
         try:
@@ -174,47 +514,94 @@ class SBOMRegistryClient:
         except Exception:
             params.fee = 10000
         
-        # Create application call transaction
         # Box name is the artifact hash (32-byte). Use current app id = 0 per SDK semantics.
-        box_name = bytes.fromhex(artifact_hash) if not isinstance(artifact_hash, bytes) else artifact_hash
-        txn = ApplicationCallTxn(
+        box_name = _hex_bytes(artifact_hash)
+        return ApplicationCallTxn(
             sender=self.address,
             sp=params,
             index=self.app_id,
             on_complete=transaction.OnComplete.NoOpOC,
             app_args=[
-                b"submit_verification", 
+                SUBMIT_VERIFICATION, 
                 box_name,
                 profile_id.encode()
             ],
             boxes=[(0, box_name)]
         )
+    
+    def register_artifact(self, artifact_hash, profile_id="default", sp=None):
+        """Register an artifact for verification.
+        Pass sp to reuse suggested params already fetched by the caller.
+        """
+        # Create application call transaction
+        txn = self.make_register_artifact_txn(artifact_hash, profile_id, copy.copy(sp) if sp is not None else None)
         
         # Sign and send
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
-        print(f"Artifact registered successfully")
+        logger.info("Artifact registered: artifact=%s profile=%s tx_id=%s", artifact_hash, profile_id, tx_id)
         # Return tx id along with confirmation for upstream logging
         return {"tx_id": tx_id, "confirmation": confirmed_txn}
     
+    def register_artifacts(self, artifact_hashes, profile_ids="default", max_workers=8):
+        """Register several artifacts at once.
+        
+        All transactions are signed and submitted before any confirmation is
+        awaited, so a batch usually lands in a single block instead of paying
+        one block time per artifact. profile_ids may be a single profile for
+        every artifact or a list matching artifact_hashes.
+        A hash repeated in the batch is registered once (with its first
+        profile), since the same call under shared params is the same txid.
+        Returns one {"tx_id", "confirmation"} dict per input artifact, in order.
+        """
+        artifact_hashes = list(artifact_hashes)
+        if isinstance(profile_ids, str):
+            profile_ids = [profile_ids] * len(artifact_hashes)
+        else:
+            profile_ids = list(profile_ids)
+        if len(profile_ids) != len(artifact_hashes):
+            raise ValueError("profile_ids must match artifact_hashes in length")
+        if not artifact_hashes:
+            return []
+        # First profile per distinct hash, in input order
+        unique = {}
+        for h, pid in zip(artifact_hashes, profile_ids):
+            unique.setdefault(h, pid)
+        # One suggested_params call covers the whole batch
+        params = cached_suggested_params(self.algod_client)
+        signed_txns = [
+            self.make_register_artifact_txn(h, pid, copy.copy(params)).sign(self.private_key)
+            for h, pid in unique.items()
+        ]
+        
+        # Submissions are independent RPCs; send them concurrently
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(signed_txns))) as pool:
+            tx_ids = list(pool.map(self.send_signed, signed_txns))
+        
+        confirmations = self.wait_for_confirmations(tx_ids)
+        logger.info("Artifacts registered: count=%d", len(tx_ids))
+        results = {
+            h: {"tx_id": tx_id, "confirmation": confirmations[tx_id]}
+            for h, tx_id in zip(unique, tx_ids)
+        }
+        return [results[h] for h in artifact_hashes]
+    
     def query_verification_status(self, artifact_hash):
         """Query verification status of an artifact"""
-        print(f"Querying verification status for: {artifact_hash}")
-        
-        params = self.algod_client.suggested_params()
+        params = cached_suggested_params(self.algod_client)
         
         # Create application call transaction
-        box_name = bytes.fromhex(artifact_hash) if not isinstance(artifact_hash, bytes) else artifact_hash
+        box_name = _hex_bytes(artifact_hash)
         txn = ApplicationCallTxn(
             sender=self.address,
             sp=params,
             index=self.app_id,
             on_complete=transaction.OnComplete.NoOpOC,
             app_args=[
-                b"query_verification",
+                QUERY_VERIFICATION,
                 box_name
             ],
             boxes=[(0, box_name)]
@@ -222,7 +609,7 @@ class SBOMRegistryClient:
         
         # Sign and send
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
@@ -231,23 +618,27 @@ class SBOMRegistryClient:
         status_code = 0  # Default to pending
         
         # Prefer parsing from logs (contract now logs the 8-byte status value)
-        try:
-            logs = confirmed_txn.get("logs", []) or []
-            if logs:
-                # Base64 decode first log entry; treat as 8-byte big-endian int
-                import base64 as _b64
-                raw = _b64.b64decode(logs[0])
-                if isinstance(raw, (bytes, bytearray)) and len(raw) >= 8:
-                    status_code = int.from_bytes(raw[:8], byteorder="big")
-        except Exception:
+        logs = confirmed_txn.get("logs") or []
+        raw = None
+        if logs:
+            # Base64 decode first log entry; treat as 8-byte big-endian int
+            try:
+                raw = base64.b64decode(logs[0])
+            except (binascii.Error, ValueError) as e:
+                # Bad padding/alphabet, or a non-ASCII log string
+                logger.warning("Undecodable status log for artifact=%s: %s", artifact_hash, e)
+        if raw is not None:
+            if len(raw) >= 8:
+                status_code = int.from_bytes(raw[:8], byteorder="big")
+        else:
             # Fallback to legacy return-value if present
             try:
                 status_code = int(confirmed_txn.get("return-value", "0"), 16)
-            except Exception:
+            except ValueError:
                 pass
         
         status_text = "Pending" if status_code == 0 else "Verified" if status_code == 1 else "Failed"
-        print(f"Verification status: {status_code} ({status_text})")
+        logger.info("Verification status: artifact=%s status=%s (%s)", artifact_hash, status_code, status_text)
         
         return status_code
     
@@ -262,17 +653,18 @@ class SBOMRegistryClient:
                 raw_key = base64.b64decode(item['key'])
                 try:
                     key = raw_key.decode('utf-8')
-                except Exception:
+                except UnicodeDecodeError:
                     key = raw_key.hex()
                 value = item['value']
                 
                 if value['type'] == 1:  # Byte slice
+                    raw_val = base64.b64decode(value['bytes'])
                     try:
                         # Try to decode as string
-                        val = base64.b64decode(value['bytes']).decode('utf-8')
-                    except Exception:
+                        val = raw_val.decode('utf-8')
+                    except UnicodeDecodeError:
                         # If it fails, use hex representation
-                        val = base64.b64decode(value['bytes']).hex()
+                        val = raw_val.hex()
                 else:  # Integer
                     val = value['uint']
                 
@@ -280,7 +672,7 @@ class SBOMRegistryClient:
             
             return state_dict
         except Exception as e:
-            print(f"Error getting contract state: {e}")
+            logger.error("Error getting contract state: %s", e)
             return {}
 
 
@@ -291,44 +683,32 @@ class ComplianceOracleClient:
         self.private_key = private_key
         self.address = account.address_from_private_key(private_key)
         self.app_id = app_id
+        # txid -> (msgpack-encoded signed txn, last valid round), kept until confirmed
+        self._signed_cache = {}
     
     def compile_program(self, source_code):
         """Compile TEAL source code to binary"""
         compile_response = self.algod_client.compile(source_code)
         return base64.b64decode(compile_response['result'])
     
+    def send_signed(self, signed_txn):
+        """Submit a signed transaction, resending the cached bytes on transient failures"""
+        return _send_signed(self.algod_client, self._signed_cache, signed_txn)
+    
     def wait_for_confirmation(self, txid, timeout=20):
         """Wait for transaction confirmation"""
-        start_round = self.algod_client.status()["last-round"] + 1
-        current_round = start_round
-
-        while current_round < start_round + timeout:
-            try:
-                pending_txn = self.algod_client.pending_transaction_info(txid)
-            except Exception:
-                return {"confirmed-round": 0, "pool-error": "Transaction not found"}
-            
-            if pending_txn.get("confirmed-round", 0) > 0:
-                return pending_txn
-            
-            if pending_txn.get("pool-error"):
-                raise Exception(f"Pool error: {pending_txn['pool-error']}")
-            
-            self.algod_client.status_after_block(current_round)
-            current_round += 1
-            
-        raise Exception(f"Transaction {txid} not confirmed after {timeout} rounds")
+        confirmed_txn = ConfirmationDispatcher.for_client(self.algod_client).wait(txid, timeout)
+        _evict_signed(self._signed_cache, txid, confirmed_txn.get("confirmed-round", 0))
+        return confirmed_txn
     
     def deploy_contract(self, approval_source, clear_source):
         """Deploy the Compliance Oracle contract"""
-        print("Deploying Compliance Oracle contract...")
-        
-        # Compile programs
-        approval_program = self.compile_program(approval_source)
-        clear_program = self.compile_program(clear_source)
+        # Compile programs (independent RPCs, so run them concurrently)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            approval_program, clear_program = pool.map(self.compile_program, (approval_source, clear_source))
         
         # Get network params
-        params = self.algod_client.suggested_params()
+        params = cached_suggested_params(self.algod_client)
         
         # Create application transaction
         txn = ApplicationCreateTxn(
@@ -343,23 +723,20 @@ class ComplianceOracleClient:
         
         # Sign and send transaction
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
         self.app_id = confirmed_txn["application-index"]
         
-        print(f"Contract deployed! App ID: {self.app_id}")
+        logger.info("Compliance Oracle deployed: app_id=%s tx_id=%s", self.app_id, tx_id)
         return self.app_id
     
-    def set_registry(self, registry_app_id):
-        """Set the registry app ID for the Compliance Oracle contract"""
-        print(f"Setting registry app ID to: {registry_app_id}")
-        
-        params = self.algod_client.suggested_params()
-        
-        # Create application call transaction
-        txn = ApplicationCallTxn(
+    def make_set_registry_txn(self, registry_app_id, params=None):
+        """Build (but do not sign) the set_registry call"""
+        if params is None:
+            params = cached_suggested_params(self.algod_client)
+        return ApplicationCallTxn(
             sender=self.address,
             sp=params,
             index=self.app_id,
@@ -369,24 +746,26 @@ class ComplianceOracleClient:
                 registry_app_id.to_bytes(8, byteorder='big')
             ]
         )
+    
+    def set_registry(self, registry_app_id):
+        """Set the registry app ID for the Compliance Oracle contract"""
+        # Create application call transaction
+        txn = self.make_set_registry_txn(registry_app_id)
         
         # Sign and send
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
-        print(f"Registry app ID set successfully")
+        logger.info("Registry app ID set: registry_app_id=%s tx_id=%s", registry_app_id, tx_id)
         return confirmed_txn
     
-    def submit_result(self, result_hash, artifact_hash, controls_passed, controls_failed, oscal_cid, registry_app_id=None):
+    def submit_result(self, result_hash, artifact_hash, controls_passed, controls_failed, oscal_cid, registry_app_id=None, sp=None):
         """Submit analysis results to the Compliance Oracle
         Optionally provide registry_app_id; if not provided, read from Oracle state.
+        Pass sp to reuse suggested params already fetched by the caller.
         """
-        print(f"Submitting analysis results for artifact: {artifact_hash}")
-        print(f"Controls: {controls_passed} passed, {controls_failed} failed")
-        print(f"OSCAL CID: {oscal_cid}")
-        
         # Resolve Registry App ID for foreign apps
         rid = registry_app_id
         if rid is None:
@@ -396,7 +775,7 @@ class ComplianceOracleClient:
             except Exception:
                 rid = None
         
-        params = self.algod_client.suggested_params()
+        params = copy.copy(sp) if sp is not None else cached_suggested_params(self.algod_client)
         # Ensure the outer app call fee covers the inner transaction fee
         params.flat_fee = True
         try:
@@ -418,10 +797,10 @@ class ComplianceOracleClient:
             on_complete=transaction.OnComplete.NoOpOC,
             app_args=[
                 b"submit_result",
-                bytes.fromhex(result_hash) if not isinstance(result_hash, bytes) else result_hash,
-                bytes.fromhex(artifact_hash) if not isinstance(artifact_hash, bytes) else artifact_hash,
-                controls_passed.to_bytes(8, byteorder='big'),
-                controls_failed.to_bytes(8, byteorder='big'),
+                _hex_bytes(result_hash),
+                _hex_bytes(artifact_hash),
+                _uint64(controls_passed),
+                _uint64(controls_failed),
                 oscal_cid.encode()
             ],
             **call_kwargs
@@ -429,11 +808,14 @@ class ComplianceOracleClient:
         
         # Sign and send
         signed_txn = txn.sign(self.private_key)
-        tx_id = self.algod_client.send_transaction(signed_txn)
+        tx_id = self.send_signed(signed_txn)
         
         # Wait for confirmation
         confirmed_txn = self.wait_for_confirmation(tx_id)
-        print(f"Analysis results submitted successfully")
+        logger.info(
+            "Analysis results submitted: artifact=%s passed=%s failed=%s oscal_cid=%s tx_id=%s",
+            artifact_hash, controls_passed, controls_failed, oscal_cid, tx_id
+        )
         # Return tx id along with confirmation for upstream logging
         return {"tx_id": tx_id, "confirmation": confirmed_txn}
     
@@ -448,17 +830,18 @@ class ComplianceOracleClient:
                 raw_key = base64.b64decode(item['key'])
                 try:
                     key = raw_key.decode('utf-8')
-                except Exception:
+                except UnicodeDecodeError:
                     key = raw_key.hex()
                 value = item['value']
                 
                 if value['type'] == 1:  # Byte slice
+                    raw_val = base64.b64decode(value['bytes'])
                     try:
                         # Try to decode as string
-                        val = base64.b64decode(value['bytes']).decode('utf-8')
-                    except Exception:
+                        val = raw_val.decode('utf-8')
+                    except UnicodeDecodeError:
                         # If it fails, use hex representation
-                        val = base64.b64decode(value['bytes']).hex()
+                        val = raw_val.hex()
                 else:  # Integer
                     val = value['uint']
                 
@@ -466,5 +849,5 @@ class ComplianceOracleClient:
             
             return state_dict
         except Exception as e:
-            print(f"Error getting contract state: {e}")
+            logger.error("Error getting contract state: %s", e)
             return {}
@@ -1,33 +1,39 @@
 #!/usr/bin/env python3
 
 import os
-import sys
+import copy
+import base64
 import json
 import uuid
 import time
 import hashlib
 import logging
+import sqlite3
+import threading
 import asyncio
 import datetime
+import functools
+import dataclasses
+import concurrent.futures
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Any, Optional
 from pathlib import Path
+import orjson
 
 # Import Algorand SDK
 from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk import transaction
 from algosdk.logic import get_application_address
+from algosdk.error import AlgodHTTPError
+from algosdk import encoding as algo_encoding
 from algosdk import transaction
-import certifi
-import ssl
-import urllib.request
 
-# Add parent directory to path for imports
 SCRIPT_DIR = Path(__file__).parent.absolute()
-ROOT_DIR = SCRIPT_DIR.parent
-sys.path.append(str(ROOT_DIR))
 
-# Import backend services
-from backend.app.services.ipfs_service import IPFSService
+# Import backend services from the same compliledger package
+from ..backend.app.services.ipfs_service import IPFSService
 
 # Import contract clients (using relative import to fix ModuleNotFoundError)
 from . import compliledger_clients
@@ -40,72 +46,216 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = SCRIPT_DIR / "contract_config.json"
+DEFAULT_ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
+CACHE_DIR = Path(os.getenv("COMPLILEDGER_CACHE_DIR", str(SCRIPT_DIR / ".cache")))
+
+
+class DiskCache:
+    """Small sqlite-backed TTL cache for pipeline results that should survive restarts"""
+    
+    def __init__(self, path, ttl):
+        self.path = Path(path)
+        self.ttl = ttl.total_seconds()
+        self._lock = threading.Lock()
+        self._conn = None
+    
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+        return self._conn
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing/expired"""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value, expires FROM cache WHERE key = ?", (orjson.dumps(key).decode(),)
+                ).fetchone()
+        except Exception as e:
+            logger.warning("Result cache read failed: %s", e)
+            return None
+        if row is None or row[1] < time.time():
+            return None
+        return orjson.loads(row[0])
+    
+    def set(self, key, value):
+        """Store a JSON-serializable value under key for the cache TTL"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (orjson.dumps(key).decode(), orjson.dumps(value), time.time() + self.ttl)
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning("Result cache write failed: %s", e)
+
+
+GATEWAY_URL = "https://gateway.pinata.cloud/ipfs/"
+EXPLORER_TX_URL = "https://testnet.explorer.perawallet.app/tx/"
+
+
+@dataclass(slots=True)
+class ProcessResult:
+    """Outcome of a completed process_artifact run.
+    
+    Only raw IDs are stored; gateway/explorer URLs are derived on access,
+    which keeps large process_artifacts batches light. get() and to_dict()
+    match the dict process_artifact returns.
+    """
+    artifact_hash: str
+    profile_id: str
+    initial_oscal_cid: str
+    verified_oscal_cid: str
+    registry_app_id: int
+    oracle_app_id: int
+    compliance_score: Any = 0
+    controls_passed: int = 0
+    controls_failed: int = 0
+    registry_tx_id: Optional[str] = None
+    oracle_tx_id: Optional[str] = None
+    status: str = "complete"
+    
+    @property
+    def initial_oscal_url(self):
+        return GATEWAY_URL + self.initial_oscal_cid
+    
+    @property
+    def verified_oscal_url(self):
+        return GATEWAY_URL + self.verified_oscal_cid
+    
+    @property
+    def registry_tx_url(self):
+        return EXPLORER_TX_URL + self.registry_tx_id if self.registry_tx_id else None
+    
+    @property
+    def oracle_tx_url(self):
+        return EXPLORER_TX_URL + self.oracle_tx_id if self.oracle_tx_id else None
+    
+    def get(self, key, default=None):
+        """dict-style access to fields and derived URLs"""
+        value = getattr(self, key, None) if key in _RESULT_KEYS else None
+        return default if value is None else value
+    
+    def to_dict(self):
+        """JSON-ready dict, including the derived URLs"""
+        return {key: getattr(self, key) for key in _RESULT_KEYS}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild from to_dict() output (derived URL keys are ignored)"""
+        return cls(**{f.name: data[f.name] for f in dataclasses.fields(cls) if f.name in data})
+
+
+# Key order of ProcessResult.to_dict()
+_RESULT_KEYS = (
+    "artifact_hash", "profile_id",
+    "initial_oscal_cid", "initial_oscal_url", "verified_oscal_cid", "verified_oscal_url",
+    "registry_app_id", "oracle_app_id",
+    "compliance_score", "controls_passed", "controls_failed",
+    "registry_tx_id", "registry_tx_url", "oracle_tx_id", "oracle_tx_url",
+    "status",
+)
+
+# Guards creation of per-run rpc_cache entries (see ContractIntegrationService._cached)
+_RPC_CACHE_LOCK = threading.Lock()
+
+# (registry_app_id, oracle_app_id, account) already linked by this process
+_LINKED = set()
+# Serializes _link_contracts across instances so only one submits the link txns
+_LINK_LOCK = threading.Lock()
+
+# Completed process_artifact results (IPFS CIDs + tx ids)
+RESULT_CACHE = DiskCache(CACHE_DIR / "process_artifact.sqlite3", datetime.timedelta(hours=24))
+
+# Everything __init__ needs that is the same for every instance in a process
+ServiceState = namedtuple(
+    "ServiceState",
+    ["algod_client", "private_key", "account", "registry_app_id", "oracle_app_id", "config"]
+)
+
+
+def _read_contract_config():
+    """Read contract_config.json, or {} if it is missing"""
+    if not CONFIG_PATH.exists():
+        return {}
+    with open(CONFIG_PATH, "r") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def load_service_state():
+    """Build the shared algod client, signing key and app IDs once per process"""
+    algod_address = os.getenv("ALGORAND_API_URL", DEFAULT_ALGOD_ADDRESS)
+    # Shared pooled client: registry and oracle calls reuse one keep-alive
+    # TLS session (verified against the certifi bundle) across instances
+    algod_client = compliledger_clients.shared_algod_client(algod_address, "")  # No token for public nodes
+    
+    try:
+        config = _read_contract_config()
+    except Exception as e:
+        logger.warning("Failed to load contract configuration: %s", e)
+        config = {}
+    
+    # Load account from mnemonic (env first, then config file for testing)
+    mnemonic_phrase = os.getenv("ALGORAND_MNEMONIC") or config.get("mnemonic")
+    if mnemonic_phrase:
+        private_key = mnemonic.to_private_key(mnemonic_phrase)
+        account_address = account.address_from_private_key(private_key)
+    else:
+        # For development without a mnemonic
+        private_key = None
+        account_address = None
+        logger.warning("No Algorand mnemonic provided. Limited functionality available.")
+    
+    # Load contract app IDs (config file, else environment variables)
+    if config:
+        registry_app_id = int(config.get("registry_app_id", 0))
+        oracle_app_id = int(config.get("oracle_app_id", 0))
+    else:
+        registry_app_id = int(os.getenv("REGISTRY_APP_ID", "0"))
+        oracle_app_id = int(os.getenv("ORACLE_APP_ID", "0"))
+    
+    return ServiceState(algod_client, private_key, account_address, registry_app_id, oracle_app_id, config)
+
+
 class ContractIntegrationService:
     """
     Service to integrate backend services (OSCAL, IPFS, AI) with deployed Algorand contracts
     """
-    def __init__(self):
-        # Connect to Algorand node
-        self.algod_address = os.getenv("ALGORAND_API_URL", "https://testnet-api.algonode.cloud")
-        self.algod_token = ""  # Not needed for public nodes
-        # Configure global HTTPS context to use certifi CA bundle (fixes SSL verification on macOS)
-        try:
-            os.environ.setdefault('SSL_CERT_FILE', certifi.where())
-            ctx = ssl.create_default_context(cafile=certifi.where())
-            opener = urllib.request.build_opener(urllib.request.HTTPSHandler(context=ctx))
-            urllib.request.install_opener(opener)
-        except Exception as _ssl_e:
-            logger.warning(f"Could not install custom SSL context, proceeding with defaults: {_ssl_e}")
-        self.algod_client = algod.AlgodClient(self.algod_token, self.algod_address)
-        
-        # Load account from mnemonic
-        self.mnemonic = os.getenv("ALGORAND_MNEMONIC")
-        if not self.mnemonic:
-            # Try to load from file for testing
-            config_path = os.path.join(os.path.dirname(__file__), "contract_config.json")
-            if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    config = json.load(f)
-                    self.mnemonic = config.get("mnemonic")
-        
-        # Setup account
-        if self.mnemonic:
-            self.private_key = mnemonic.to_private_key(self.mnemonic)
-            self.account = account.address_from_private_key(self.private_key)
-        else:
-            # For development without a mnemonic
-            self.private_key = None
-            self.account = None
-            logger.warning("No Algorand mnemonic provided. Limited functionality available.")
-        
-        # Load contract app IDs
-        try:
-            self._load_contract_config()
-        except Exception as e:
-            logger.warning(f"Failed to load contract configuration: {str(e)}")
-            # Set default values for testing
-            self.registry_app_id = int(os.getenv("REGISTRY_APP_ID", "0"))
-            self.oracle_app_id = int(os.getenv("ORACLE_APP_ID", "0"))
+    # Fixed part of every generated OSCAL metadata block (key order preserved)
+    _OSCAL_METADATA = {
+        "title": None,
+        "last-modified": None,
+        "version": "1.0",
+        "oscal-version": "1.0.0",
+        "verified": False,
+        "artifact-hash": None
+    }
+    
+    def __init__(self, state=None, http_client=None):
+        # Client, key and config are resolved once per process; pass state to share explicitly.
+        # http_client (an httpx.AsyncClient) is handed to the IPFS service for connection reuse
+        state = state or load_service_state()
+        self.algod_client = state.algod_client
+        self.private_key = state.private_key
+        self.account = state.account
+        self.registry_app_id = state.registry_app_id
+        self.oracle_app_id = state.oracle_app_id
+        self._config = state.config
+        # Set once ensure_linked has confirmed the oracle/registry linkage
+        self._linked = False
+        self._link_lock = asyncio.Lock()
         
         # Create contract clients
         if self.registry_app_id > 0 and self.oracle_app_id > 0 and self.private_key:
             self.registry_client = SBOMRegistryClient(self.algod_client, self.private_key, self.registry_app_id)
             self.oracle_client = ComplianceOracleClient(self.algod_client, self.private_key, self.oracle_app_id)
-            logger.info(f"Contract clients initialized with Registry ID: {self.registry_app_id}, Oracle ID: {self.oracle_app_id}")
-            # Ensure oracle is linked to the current registry
-            try:
-                logger.info(f"Ensuring oracle is linked to registry {self.registry_app_id}")
-                self.oracle_client.set_registry(self.registry_app_id)
-                logger.info("Oracle linked to registry successfully")
-                # Ensure registry knows the EOA oracle address (so backend can update directly)
-                try:
-                    logger.info(f"Setting registry oracle_address to EOA signer: {self.account}")
-                    self.registry_client.set_oracle(self.account)
-                    logger.info("Registry oracle_address set successfully")
-                except Exception as _inner:
-                    logger.warning(f"Could not set registry oracle_address automatically: {_inner}")
-            except Exception as e:
-                logger.warning(f"Could not link oracle to registry automatically: {e}")
+            logger.info("Contract clients initialized with Registry ID: %s, Oracle ID: %s", self.registry_app_id, self.oracle_app_id)
         else:
             logger.warning("Contract clients not initialized - missing app IDs or private key")
             self.registry_client = None
@@ -113,34 +263,82 @@ class ContractIntegrationService:
             
         # Initialize IPFS service for real storage (no more mocking)
         try:
-            self.ipfs_service = IPFSService()
+            self.ipfs_service = IPFSService(http_client)
             logger.info("IPFS service initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize IPFS service: {str(e)}")
+            logger.error("Failed to initialize IPFS service: %s", e)
             self.ipfs_service = None
-            
-    def _load_contract_config(self):
-        """Load contract configuration from file"""
-        config_path = os.path.join(os.path.dirname(__file__), "contract_config.json")
+    
+    async def ensure_linked(self):
+        """
+        Make sure the oracle points at the registry and the registry's oracle is
+        the EOA signer, submitting set_registry/set_oracle only where the chain
+        state differs. Runs at most once per deployment and signer in a process
+        once it succeeds; concurrent callers wait for the first.
+        """
+        if self._linked or not (self.registry_client and self.oracle_client):
+            return
+        async with self._link_lock:
+            if not self._linked:
+                self._linked = await asyncio.to_thread(self._link_contracts)
+    
+    def _read_global_state(self, app_id):
+        """Raw global state of an app as {key bytes: bytes or int}"""
+        info = self.algod_client.application_info(app_id)
+        state = {}
+        for item in info["params"].get("global-state", []):
+            value = item["value"]
+            state[base64.b64decode(item["key"])] = base64.b64decode(value["bytes"]) if value["type"] == 1 else value["uint"]
+        return state
+    
+    def _link_contracts(self):
+        """Point the oracle at the registry and the registry at the EOA signer.
+        Blocking; returns True once both links are in place.
+        """
+        link_key = (self.registry_app_id, self.oracle_app_id, self.account)
+        with _LINK_LOCK:
+            if link_key in _LINKED:
+                return True
+            linked = self._submit_links()
+            if linked:
+                _LINKED.add(link_key)
+            return linked
+    
+    def _submit_links(self):
+        """Read both apps' link state and submit set_registry/set_oracle where it differs"""
+        try:
+            oracle_linked = self._read_global_state(self.oracle_app_id).get(b"registry_app_id") == self.registry_app_id
+            registry_linked = self._read_global_state(self.registry_app_id).get(b"oracle_address") == algo_encoding.decode_address(self.account)
+        except Exception as e:
+            logger.warning("Could not read contract link state: %s", e)
+            oracle_linked = registry_linked = False
         
-        if os.path.exists(config_path):
-            with open(config_path, "r") as f:
-                config = json.load(f)
-                self.registry_app_id = int(config.get("registry_app_id", 0))
-                self.oracle_app_id = int(config.get("oracle_app_id", 0))
-        else:
-            # Try environment variables
-            self.registry_app_id = int(os.getenv("REGISTRY_APP_ID", "0"))
-            self.oracle_app_id = int(os.getenv("ORACLE_APP_ID", "0"))
+        if not oracle_linked:
+            try:
+                logger.info("Ensuring oracle is linked to registry %s", self.registry_app_id)
+                self.oracle_client.set_registry(self.registry_app_id)
+                logger.info("Oracle linked to registry successfully")
+            except Exception as e:
+                logger.warning("Could not link oracle to registry automatically: %s", e)
+                return False
+        # Ensure registry knows the EOA oracle address (so backend can update directly)
+        if not registry_linked:
+            try:
+                logger.info("Setting registry oracle_address to EOA signer: %s", self.account)
+                self.registry_client.set_oracle(self.account)
+                logger.info("Registry oracle_address set successfully")
+            except Exception as _inner:
+                logger.warning("Could not set registry oracle_address automatically: %s", _inner)
+                return False
+        return True
     
     async def process_artifact(self, artifact_data, profile_id="default"):
         """
         Process an artifact through the entire pipeline:
-        1. Generate mock OSCAL documents (simplified for contract testing)
-        2. Generate mock IPFS CID (simplified for contract testing)
-        3. Register on Algorand blockchain
-        4. Submit for AI analysis (mock)
-        5. Update verification status
+        1. Generate initial and verified OSCAL documents
+        2. Pin both to IPFS while registering on Algorand (concurrently)
+        3. Update verification status
+        4. Submit results to the oracle
         
         Args:
             artifact_data: Dictionary containing artifact data
@@ -148,163 +346,173 @@ class ContractIntegrationService:
             
         Returns:
             Dictionary with processing results
+        
+        Fully anchored results are cached on disk for 24h per artifact, profile,
+        analysis_results["result_hash"] (set by SmartContractAnalyzer) and app
+        IDs; analyses without a result_hash and runs where a pin or transaction
+        failed are never cached. Set artifact_data["force"] to bypass.
+        """
+        result = await self._process(artifact_data, profile_id)
+        return result.to_dict() if isinstance(result, ProcessResult) else result
+    
+    async def _process(self, artifact_data, profile_id):
+        """process_artifact returning a ProcessResult (or the error dict)"""
+        cache_key = None
+        artifact_hash = artifact_data.get("hash")
+        # Only an analysis-supplied result_hash identifies the analysis; without
+        # one a changed analysis would hit a stale entry, so skip the cache
+        result_hash = artifact_data.get("analysis_results", {}).get("result_hash")
+        if artifact_hash and result_hash:
+            cache_key = (
+                artifact_hash,
+                profile_id,
+                result_hash,
+                self.registry_app_id,
+                self.oracle_app_id,
+            )
+            if not artifact_data.get("force"):
+                cached = RESULT_CACHE.get(cache_key)
+                if cached is not None:
+                    logger.info("Returning cached result for artifact: %s", artifact_hash)
+                    return ProcessResult.from_dict(cached)
+        
+        result = await self._run_pipeline(artifact_data, profile_id)
+        if cache_key is not None and self._is_cacheable(result):
+            RESULT_CACHE.set(cache_key, result.to_dict())
+        return result
+    
+    @staticmethod
+    def _is_cacheable(result):
+        """Only fully anchored runs are replayed: both transactions landed and
+        both CIDs are real, so a transient failure is retried on the next call"""
+        return (
+            isinstance(result, ProcessResult)
+            and bool(result.registry_tx_id and result.oracle_tx_id)
+            and not any(str(cid).startswith("mock-") for cid in (result.initial_oscal_cid, result.verified_oscal_cid))
+        )
+    
+    async def process_artifacts(self, items, profile_id="default", concurrency=8):
+        """
+        Process several artifacts concurrently
+        
+        Args:
+            items: Iterable of artifact_data dictionaries
+            profile_id: ID of the compliance profile to use for every artifact
+            concurrency: Maximum number of artifacts in flight at once
+            
+        Returns:
+            List of ProcessResult objects (or error dictionaries), in the same
+            order as items. Results support .get() and to_dict() for JSON.
         """
+        sem = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*[self._guarded(sem, item, profile_id) for item in items])
+    
+    async def _guarded(self, sem, artifact_data, profile_id):
+        """Run process_artifact once a concurrency slot is free"""
+        async with sem:
+            return await self._process(artifact_data, profile_id)
+    
+    async def _run_pipeline(self, artifact_data, profile_id):
+        """Uncached body of process_artifact"""
         try:
             # 1. Calculate artifact hash (should be included in artifact_data)
             artifact_hash = artifact_data.get("hash")
             if not artifact_hash:
                 raise ValueError("Artifact hash is required")
             
-            logger.info(f"Processing artifact with hash: {artifact_hash}")
+            logger.info("Processing artifact with hash: %s", artifact_hash)
+            # Decode the box name once; fallback CIDs and the result hash all
+            # derive from sha256("<artifact_hash>-...") so share that prefix
+            artifact_hash_bytes = bytes.fromhex(artifact_hash)
+            hash_prefix = hashlib.sha256(f"{artifact_hash}-".encode())
+            # Read-only RPC results shared by every step of this run
+            rpc_cache = {}
+            # Check (and if needed fix) the oracle/registry linkage in the
+            # background; only the verification calls below depend on it
+            link_task = asyncio.create_task(self.ensure_linked())
+            # Start fetching suggested params now so the round trip overlaps
+            # document generation and the pins instead of a later step
+            sp_task = None
+            if self.registry_client or self.oracle_client:
+                sp_task = asyncio.create_task(asyncio.to_thread(
+                    self._cached, rpc_cache, "suggested_params", compliledger_clients.cached_suggested_params, self.algod_client
+                ))
             
-            # 2. Generate OSCAL component definition
-            logger.info("Generating OSCAL component definition")
-            initial_analysis = {"compliance_score": artifact_data.get("analysis_results", {}).get("compliance_score", 0), "findings": []}
-            oscal_document = self._generate_oscal(artifact_data, initial_analysis)
-            
-            # 3. Store OSCAL document on real IPFS
-            logger.info("Storing initial OSCAL document on IPFS")
-            if self.ipfs_service:
-                oscal_response = await self.ipfs_service.pin_json(
-                    data=oscal_document,
-                    name=f"oscal-initial-{artifact_hash[:8]}",
-                    artifact_hash=artifact_hash
-                )
-                oscal_cid = oscal_response.get("ipfs_cid")
-                logger.info(f"OSCAL document stored on IPFS with CID: {oscal_cid}")
-            else:
-                # Fallback only if IPFS service initialization failed
-                oscal_cid = hashlib.sha256(f"{artifact_hash}-oscal".encode()).hexdigest()[:16]
-                logger.warning("Using fallback hash for OSCAL CID (IPFS service unavailable)")
-
+            # 2. Generate both OSCAL documents up front so they can be pinned
+            # while the artifact is being registered on chain
+            logger.info("Generating OSCAL documents")
+            analysis_results = artifact_data.get("analysis_results", {})
+            initial_analysis = {"compliance_score": analysis_results.get("compliance_score", 0), "findings": []}
+            timestamp = datetime.datetime.now().isoformat()
+            oscal_document = self._generate_oscal(artifact_data, initial_analysis, timestamp=timestamp)
+            updated_oscal = self._generate_oscal(artifact_data, analysis_results, verified=True, timestamp=timestamp)
             
-            # 4. Ensure registry app address is funded for box storage, then register artifact on blockchain
-            registry_tx_id = None
-            registry_tx_explorer = None
+            # 3. Pin both documents to IPFS and register the artifact on chain
+            # concurrently; the three calls are independent of each other
             if self.registry_client:
-                try:
-                    app_addr = get_application_address(self.registry_app_id)
-                    acct = self.algod_client.account_info(app_addr)
-                    balance = acct.get("amount", 0)
-                except Exception:
-                    balance = 0
-
-                # Fund if balance < 800000 microAlgos (0.8 ALGO) to cover box min-balance comfortably
-                if balance < 800000:
-                    try:
-                        params = self.algod_client.suggested_params()
-                        pay_txn = transaction.PaymentTxn(
-                            sender=self.account,
-                            sp=params,
-                            receiver=app_addr,
-                            amt=1000000  # 1.0 ALGO buffer for box storage
-                        )
-                        signed = pay_txn.sign(self.private_key)
-                        txid = self.algod_client.send_transaction(signed)
-                        # Wait for confirmation lightly
-                        start = self.algod_client.status()["last-round"]
-                        while True:
-                            info = self.algod_client.pending_transaction_info(txid)
-                            if info.get("confirmed-round", 0) > 0:
-                                break
-                            self.algod_client.status_after_block(start + 1)
-                            start += 1
-                        logger.info("Funded registry app address for box storage")
-                    except Exception as _e:
-                        logger.warning(f"Could not fund app address automatically: {_e}")
-
-                # Check if box already exists; if so, skip registration to avoid BoxCreate assert
-                box_exists = False
-                try:
-                    box_name = bytes.fromhex(artifact_hash)
-                    _ = self.algod_client.application_box_by_name(self.registry_app_id, box_name)
-                    box_exists = True
-                except Exception:
-                    box_exists = False
-
-                if box_exists:
-                    logger.info("Artifact box already exists; skipping registration")
-                    tx_result = {"tx_id": None}
-                else:
-                    logger.info(f"Registering artifact on blockchain with hash: {artifact_hash}")
-                    tx_result = self.registry_client.register_artifact(artifact_hash, profile_id)
-                try:
-                    registry_tx_id = tx_result.get("tx_id") if isinstance(tx_result, dict) else None
-                except Exception:
-                    registry_tx_id = None
-                if registry_tx_id:
-                    registry_tx_explorer = f"https://testnet.explorer.perawallet.app/tx/{registry_tx_id}"
-                    logger.info(f"Artifact registered on chain. Tx: {registry_tx_id} | {registry_tx_explorer}")
-                else:
-                    logger.info("Artifact registered on chain")
+                register = asyncio.to_thread(self._register_on_chain, artifact_hash, artifact_hash_bytes, profile_id, rpc_cache)
             else:
                 logger.warning("Registry client not available - skipping blockchain registration")
+                register = asyncio.sleep(0, result=None)
+            oscal_cid, registry_tx_id, verified_oscal_cid = await asyncio.gather(
+                self._pin_oscal(oscal_document, f"oscal-initial-{artifact_hash[:8]}", artifact_hash, hash_prefix, b"oscal"),
+                register,
+                self._pin_oscal(updated_oscal, f"oscal-verified-{artifact_hash[:8]}", artifact_hash, hash_prefix, b"verified"),
+                return_exceptions=True
+            )
+            # Each call ran to completion on its own; surface the first failure now
+            for outcome in (registry_tx_id, oscal_cid, verified_oscal_cid):
+                if isinstance(outcome, BaseException):
+                    raise outcome
             
-            # 5. Use actual analysis results from artifact_data
+            # 4. Use actual analysis results from artifact_data
             logger.info("Processing AI analysis results")
-            analysis_results = artifact_data.get("analysis_results", {})
-            result_hash = hashlib.sha256(f"{artifact_hash}-{time.time()}".encode()).hexdigest()[:32]
             
             # Optimize integer storage by using fewer integer values
             controls_passed = analysis_results.get("controls_passed", 0)
             controls_failed = analysis_results.get("controls_failed", 0)
             compliance_score = analysis_results.get("compliance_score", 0)
-            findings_count = analysis_results.get("findings_count", 0)
-            
-            # 6. Generate verified OSCAL document with real analysis
-            logger.info("Generating verified OSCAL document with analysis results")
-            updated_oscal = self._generate_oscal(artifact_data, analysis_results, verified=True)
             
-            # 7. Store verified OSCAL on real IPFS
-            logger.info("Storing verified OSCAL document on IPFS")
-            if self.ipfs_service:
-                verified_response = await self.ipfs_service.pin_json(
-                    data=updated_oscal,
-                    name=f"oscal-verified-{artifact_hash[:8]}",
-                    artifact_hash=artifact_hash
-                )
-                verified_oscal_cid = verified_response.get("ipfs_cid")
-                verified_oscal_url = verified_response.get("ipfs_url")
-                logger.info(f"Verified OSCAL stored on IPFS with CID: {verified_oscal_cid}")
-            else:
-                # Fallback only if IPFS service initialization failed
-                verified_oscal_cid = hashlib.sha256(f"{artifact_hash}-verified".encode()).hexdigest()[:16]
-                verified_oscal_url = f"https://gateway.pinata.cloud/ipfs/{verified_oscal_cid}"
-                logger.warning("Using fallback hash for verified OSCAL CID (IPFS service unavailable)")
-            
-            # 8. Update registry directly with verification status (EOA oracle)
             oracle_tx_id = None
-            oracle_tx_explorer = None
+            await link_task
+            sp = None
+            if sp_task is not None:
+                try:
+                    sp = await sp_task
+                except Exception as e:
+                    # Clients fetch their own params when sp is None
+                    logger.warning("Could not fetch suggested params: %s", e)
             # Compute verification status: 1 = pass (no failures), 2 = fail (some failures)
             verification_status = 1 if controls_failed == 0 else 2
+            # Derive a stable result hash if not provided by analysis layer
+            result_hash = analysis_results.get("result_hash")
+            if not result_hash:
+                result_digest = hash_prefix.copy()
+                result_digest.update(f"{verified_oscal_cid}-{analysis_results.get('compliance_score', 0)}".encode())
+                result_hash = result_digest.hexdigest()[:32]
+            
+            # 5. Update registry directly with verification status (EOA oracle)
             if self.registry_client:
                 try:
                     txr = self.registry_client.update_verification(
                         artifact_hash,
                         verification_status,
-                        verified_oscal_cid
+                        verified_oscal_cid,
+                        sp=sp
                     )
                     try:
                         rid = txr.get("tx_id") if isinstance(txr, dict) else None
                     except Exception:
                         rid = None
                     if rid:
-                        logger.info(f"Registry updated with verification status. Tx: {rid} | https://testnet.explorer.perawallet.app/tx/{rid}")
+                        logger.info("Registry updated with verification status. Tx: %s | https://testnet.explorer.perawallet.app/tx/%s", rid, rid)
                     else:
                         logger.info("Registry updated with verification status")
                 except Exception as e:
-                    logger.error(f"Error updating registry with verification status: {e}")
-            # 9. Optionally submit to oracle for logging/forwarding
+                    logger.error("Error updating registry with verification status: %s", e)
+            # 6. Optionally submit to oracle for logging/forwarding
             if self.oracle_client:
                 logger.info("Submitting verification result to oracle")
-                # Derive a stable result hash if not provided by analysis layer
-                try:
-                    result_hash = analysis_results.get("result_hash")
-                except Exception:
-                    result_hash = None
-                if not result_hash:
-                    base = f"{artifact_hash}-{verified_oscal_cid}-{analysis_results.get('compliance_score', 0)}"
-                    result_hash = hashlib.sha256(base.encode()).hexdigest()[:32]
                 # Use previously computed safe defaults
                 controls_passed = analysis_results.get("controls_passed", controls_passed)
                 controls_failed = analysis_results.get("controls_failed", controls_failed)
@@ -316,67 +524,178 @@ class ContractIntegrationService:
                         artifact_hash,
                         controls_passed,
                         controls_failed,
-                        verified_oscal_cid
+                        verified_oscal_cid,
+                        sp=sp
                     )
                     try:
                         oracle_tx_id = oracle_txn.get("tx_id") if isinstance(oracle_txn, dict) else None
                     except Exception:
                         oracle_tx_id = None
                     if oracle_tx_id:
-                        oracle_tx_explorer = f"https://testnet.explorer.perawallet.app/tx/{oracle_tx_id}"
-                        logger.info(f"Verification result submitted successfully. Tx: {oracle_tx_id} | {oracle_tx_explorer}")
+                        logger.info("Verification result submitted successfully. Tx: %s | %s%s", oracle_tx_id, EXPLORER_TX_URL, oracle_tx_id)
                     else:
                         logger.info("Verification result submitted successfully")
                 except Exception as e:
-                    logger.error(f"Error submitting result to blockchain: {e}")
+                    logger.error("Error submitting result to blockchain: %s", e)
             else:
                 logger.warning("Oracle client not available - skipping result submission")
             
             # Return comprehensive results
-            return {
-                "artifact_hash": artifact_hash,
-                "profile_id": profile_id,
-                "initial_oscal_cid": oscal_cid,
-                "initial_oscal_url": f"https://gateway.pinata.cloud/ipfs/{oscal_cid}",
-                "verified_oscal_cid": verified_oscal_cid,
-                "verified_oscal_url": f"https://gateway.pinata.cloud/ipfs/{verified_oscal_cid}",
-                "registry_app_id": self.registry_app_id,
-                "oracle_app_id": self.oracle_app_id,
-                "compliance_score": analysis_results.get("compliance_score", compliance_score),
-                "controls_passed": analysis_results.get("controls_passed", controls_passed),
-                "controls_failed": analysis_results.get("controls_failed", controls_failed),
-                "registry_tx_id": registry_tx_id,
-                "registry_tx_url": registry_tx_explorer,
-                "oracle_tx_id": oracle_tx_id,
-                "oracle_tx_url": oracle_tx_explorer,
-                "status": "complete"
-            }
+            return ProcessResult(
+                artifact_hash=artifact_hash,
+                profile_id=profile_id,
+                initial_oscal_cid=oscal_cid,
+                verified_oscal_cid=verified_oscal_cid,
+                registry_app_id=self.registry_app_id,
+                oracle_app_id=self.oracle_app_id,
+                compliance_score=analysis_results.get("compliance_score", compliance_score),
+                controls_passed=analysis_results.get("controls_passed", controls_passed),
+                controls_failed=analysis_results.get("controls_failed", controls_failed),
+                registry_tx_id=registry_tx_id,
+                oracle_tx_id=oracle_tx_id
+            )
             
         except Exception as e:
-            logger.error(f"Error processing artifact: {str(e)}")
+            logger.error("Error processing artifact: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
                 "artifact_hash": artifact_data.get("hash", "unknown")
             }
     
-    def _generate_oscal(self, artifact_data, analysis_results, verified=False):
-        """Generate an OSCAL document from artifact and analysis data"""
-        doc_uuid = str(uuid.uuid4())
-        timestamp = datetime.datetime.now().isoformat()
-        artifact_hash = artifact_data.get("hash", "unknown")
+    async def _pin_oscal(self, document, name, artifact_hash, hash_prefix, fallback_suffix):
+        """Pin an OSCAL document to IPFS and return its CID"""
+        if not self.ipfs_service:
+            # Fallback only if IPFS service initialization failed
+            logger.warning("Using fallback hash for %s CID (IPFS service unavailable)", name)
+            fallback = hash_prefix.copy()
+            fallback.update(fallback_suffix)
+            return fallback.hexdigest()[:16]
+        response = await self.ipfs_service.pin_bytes(
+            payload=orjson.dumps(document, option=orjson.OPT_SORT_KEYS),
+            name=name,
+            artifact_hash=artifact_hash
+        )
+        cid = response.get("ipfs_cid")
+        logger.info("%s stored on IPFS with CID: %s", name, cid)
+        return cid
+    
+    @staticmethod
+    def _cached(rpc_cache, key, fn, *args):
+        """Memoize a read-only RPC for the duration of one pipeline run.
+        Thread-safe: concurrent callers for the same key share a single call.
+        """
+        with _RPC_CACHE_LOCK:
+            future = rpc_cache.get(key)
+            owner = future is None
+            if owner:
+                future = rpc_cache[key] = concurrent.futures.Future()
+        if owner:
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+    
+    def _register_on_chain(self, artifact_hash, box_name, profile_id, rpc_cache):
+        """Fund the registry app for box storage if needed, then register the artifact.
+        Blocking; run via asyncio.to_thread. Returns the registration tx id, or None
+        if the artifact was already registered.
+        """
+        app_addr = self._cached(rpc_cache, "registry_app_address", get_application_address, self.registry_app_id)
+        try:
+            acct = self._cached(rpc_cache, ("account_info", app_addr), self.algod_client.account_info, app_addr)
+            balance = acct.get("amount", 0)
+        except Exception:
+            balance = 0
+
+        sp = self._cached(rpc_cache, "suggested_params", compliledger_clients.cached_suggested_params, self.algod_client)
+        # Register unconditionally; an existing box makes the contract reject
+        # the call, which is cheaper to detect afterwards than to pre-check
+        logger.info("Registering artifact on blockchain with hash: %s", artifact_hash)
+        try:
+            # Fund if balance < 800000 microAlgos (0.8 ALGO) to cover box min-balance comfortably
+            if balance < 800000:
+                tx_result = self._fund_and_register(app_addr, artifact_hash, profile_id, sp)
+            else:
+                tx_result = self.registry_client.register_artifact(artifact_hash, profile_id, sp=sp)
+        except AlgodHTTPError as e:
+            if not self._box_exists(box_name, str(e)):
+                raise
+            logger.info("Artifact box already exists; skipping registration")
+            return None
+        registry_tx_id = tx_result.get("tx_id") if isinstance(tx_result, dict) else None
+        if registry_tx_id:
+            logger.info("Artifact registered on chain. Tx: %s | https://testnet.explorer.perawallet.app/tx/%s", registry_tx_id, registry_tx_id)
+        else:
+            logger.info("Artifact registered on chain")
+        return registry_tx_id
+    
+    def _fund_and_register(self, app_addr, artifact_hash, profile_id, sp):
+        """Send the box-storage funding payment and the registration as one
+        atomic group, so both land in a single confirmation round.
+        Funding stays best effort: if the group is rejected for any reason
+        other than an existing box (e.g. a low signer balance), the artifact
+        is registered on its own.
+        """
+        try:
+            return self._send_fund_and_register(app_addr, artifact_hash, profile_id, sp)
+        except AlgodHTTPError as e:
+            if self._box_exists_message(str(e)):
+                raise
+            logger.warning("Could not fund registry app address; registering without funding: %s", e)
+            return self.registry_client.register_artifact(artifact_hash, profile_id, sp=sp)
+    
+    def _send_fund_and_register(self, app_addr, artifact_hash, profile_id, sp):
+        """Submit the funding payment + registration group and wait for it"""
+        pay_txn = transaction.PaymentTxn(
+            sender=self.account,
+            sp=copy.copy(sp),
+            receiver=app_addr,
+            amt=1000000  # 1.0 ALGO buffer for box storage
+        )
+        reg_txn = self.registry_client.make_register_artifact_txn(artifact_hash, profile_id, copy.copy(sp))
+        transaction.assign_group_id([pay_txn, reg_txn])
+        self.algod_client.send_transactions([pay_txn.sign(self.private_key), reg_txn.sign(self.private_key)])
+        tx_id = reg_txn.get_txid()
+        confirmed_txn = self.registry_client.wait_for_confirmation(tx_id)
+        logger.info("Funded registry app address for box storage")
+        return {"tx_id": tx_id, "confirmation": confirmed_txn}
+    
+    def _box_exists(self, box_name, error_message):
+        """Decide whether a rejected registration was due to the artifact box already existing"""
+        if self._box_exists_message(error_message):
+            return True
+        # The rejection text does not always carry the contract's log; only
+        # on this failure path, confirm by reading the box
+        try:
+            self.algod_client.application_box_by_name(self.registry_app_id, box_name)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _box_exists_message(error_message):
+        """Whether a rejection message itself says the artifact box exists"""
+        message = error_message.lower()
+        return "err_box_exists" in message or ("box" in message and "already" in message)
+    
+    def _generate_oscal(self, artifact_data, analysis_results, verified=False, timestamp=None):
+        """Generate an OSCAL document from artifact and analysis data.
+        Pass timestamp to share one last-modified value across documents of a run.
+        """
+        # Fill a copy of the fixed template; only the per-artifact fields change
+        metadata = self._OSCAL_METADATA.copy()
+        metadata["title"] = f"Compliance Assessment for {artifact_data.get('name', 'Unknown Artifact')}"
+        metadata["last-modified"] = timestamp or datetime.datetime.now().isoformat()
+        metadata["verified"] = verified
+        metadata["artifact-hash"] = artifact_data.get("hash", "unknown")
         
         # Create a simplified OSCAL structure (not full OSCAL but with essential elements)
         return {
-            "uuid": doc_uuid,
-            "metadata": {
-                "title": f"Compliance Assessment for {artifact_data.get('name', 'Unknown Artifact')}",
-                "last-modified": timestamp,
-                "version": "1.0",
-                "oscal-version": "1.0.0",
-                "verified": verified,
-                "artifact-hash": artifact_hash
-            },
+            # OSCAL requires the canonical hyphenated RFC 4122 form
+            "uuid": str(uuid.uuid4()),
+            "metadata": metadata,
             "results": {
                 "score": analysis_results.get("compliance_score", 0),
                 "findings": analysis_results.get("findings", []),
@@ -384,12 +703,17 @@ class ContractIntegrationService:
                 "controls_failed": analysis_results.get("controls_failed", 0)
             }
         }
-    
-    def _generate_mock_cid(self, content_identifier):
-        """Generate a mock IPFS CID based on content"""
-        # Create a deterministic mock CID based on content
-        mock_hash = hashlib.sha256(content_identifier.encode()).hexdigest()[:16]
-        return f"Qm{mock_hash}MOCKCID{int(time.time()) % 1000}"
+
+def warm_algod_connection():
+    """Open the pooled algod connection and cache genesis/fee params ahead of the first request.
+    Blocking and best effort; call it from the app's startup hook (not at import).
+    """
+    try:
+        algod_client = compliledger_clients.shared_algod_client(os.getenv("ALGORAND_API_URL", DEFAULT_ALGOD_ADDRESS), "")
+        compliledger_clients.cached_suggested_params(algod_client)
+    except Exception:
+        # Best effort: the first real call simply pays the cold start instead
+        pass
 
 # Example usage
 async def test_integration():
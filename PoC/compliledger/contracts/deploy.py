@@ -1,23 +1,61 @@
 import os
+import re
 import base64
+import concurrent.futures
+import hashlib
+import inspect
+import threading
+import weakref
+from pathlib import Path
 from algosdk import account, mnemonic, transaction
-from algosdk.v2client import algod
 import json
-from algosdk.logic import get_application_address
 from algosdk import encoding as algo_encoding
 import time
-import certifi
+try:
+    # Imported as compliledger.contracts.deploy: share the package's client module
+    from .compliledger_clients import shared_algod_client, cached_suggested_params, record_round, SET_ORACLE, ConfirmationDispatcher
+    from .teal_files import write_if_changed
+except ImportError:
+    # Run as a script from contracts/ (python deploy.py, redeploy_oracle.py)
+    from compliledger_clients import shared_algod_client, cached_suggested_params, record_round, SET_ORACLE, ConfirmationDispatcher
+    from teal_files import write_if_changed
+
+# Upper bound on rounds (or fallback polls) to wait for a confirmation
+WAIT_ROUNDS = 20
+
+# Compiled bytecode (<sha256 of TEAL>.bin) and PyTeal codegen stamps
+COMPILE_CACHE_DIR = Path(__file__).with_name(".compile_cache")
+# In-process bytecode by TEAL sha256, shared by every deployer (deploy and redeploy_oracle)
+_compile_cache = {}
+
+# Recent algod status per client, shared by concurrent waiters
+_STATUS_CACHE = weakref.WeakKeyDictionary()
+_STATUS_LOCK = threading.Lock()
+# Seconds a status response is reused (well under one ~3s round)
+STATUS_TTL = 0.5
+
+def cached_status(algod_client, ttl=STATUS_TTL):
+    """Return algod status, coalescing calls made within ttl seconds of each other"""
+    with _STATUS_LOCK:
+        now = time.monotonic()
+        entry = _STATUS_CACHE.get(algod_client)
+        if entry is None or now - entry[0] > ttl:
+            entry = _STATUS_CACHE[algod_client] = (now, algod_client.status())
+    return entry[1]
 
 class ContractDeployer:
-    def __init__(self, algod_address="https://testnet-api.algonode.cloud", algod_token=""):
-        """Initialize the deployer with Algorand client"""
-        # Ensure TLS verification uses certifi bundle (fixes SSL on macOS)
-        try:
-            os.environ.setdefault("SSL_CERT_FILE", certifi.where())
-        except Exception:
-            pass
-        headers = {"User-Agent": "py-algorand-sdk"}
-        self.algod_client = algod.AlgodClient(algod_token, algod_address, headers=headers)
+    def __init__(self, algod_address="https://testnet-api.algonode.cloud", algod_token="", use_subscription=False):
+        """Initialize the deployer with Algorand client
+        
+        With use_subscription, confirmations are delivered by the shared
+        ConfirmationDispatcher block watcher, so concurrent deploys on one
+        node share a single status_after_block per round instead of each
+        polling on its own.
+        """
+        self.use_subscription = use_subscription
+        # Pooled keep-alive client (certifi-verified TLS): each RPC after the
+        # first reuses the open connection instead of a fresh handshake
+        self.algod_client = shared_algod_client(algod_address, algod_token)
         
         # Load account from mnemonic if provided in env var
         try:
@@ -42,33 +80,64 @@ class ContractDeployer:
             raise
     
     def compile_program(self, source_code):
-        """Compile TEAL source code to binary"""
+        """Compile TEAL source code to binary, reusing cached bytecode for unchanged sources"""
+        key = hashlib.sha256(source_code.encode()).hexdigest()
+        program = _compile_cache.get(key)
+        if program is not None:
+            return program
+        cache_path = COMPILE_CACHE_DIR / f"{key}.bin"
+        if cache_path.exists():
+            program = _compile_cache[key] = cache_path.read_bytes()
+            return program
+        
         try:
             compile_response = self.algod_client.compile(source_code)
-            return base64.b64decode(compile_response["result"])
+            program = base64.b64decode(compile_response["result"])
         except Exception as e:
             print(f"Error compiling TEAL: {e}")
             raise
+        _compile_cache[key] = program
+        
+        try:
+            COMPILE_CACHE_DIR.mkdir(exist_ok=True)
+            cache_path.write_bytes(program)
+        except OSError as e:
+            print(f"Warning: failed to cache compiled TEAL: {e}")
+        return program
     
-    def wait_for_confirmation(self, txid):
+    def wait_for_confirmation(self, txid, max_rounds=WAIT_ROUNDS):
         """Wait for transaction confirmation"""
-        last_round = self.algod_client.status().get("last-round")
-        while True:
+        if self.use_subscription:
+            txinfo = ConfirmationDispatcher.for_client(self.algod_client).wait(txid, max_rounds)
+            if txinfo.get("confirmed-round", 0) == 0:
+                raise Exception(f"Transaction {txid} not confirmed: {txinfo.get('pool-error')}")
+            print(f"Transaction {txid} confirmed in round {txinfo.get('confirmed-round')}")
+            return txinfo
+        
+        # A round-old status is fine: status_after_block returns at once if newer blocks exist
+        last_round = cached_status(self.algod_client).get("last-round")
+        record_round(self.algod_client, last_round)
+        for _ in range(max_rounds):
             txinfo = self.algod_client.pending_transaction_info(txid)
             if txinfo.get("confirmed-round", 0) > 0:
                 print(f"Transaction {txid} confirmed in round {txinfo.get('confirmed-round')}")
                 return txinfo
             
-            last_round += 1
-            self.algod_client.status_after_block(last_round)
+            # Block server-side until the next round instead of sleeping
+            try:
+                last_round = self.algod_client.status_after_block(last_round).get("last-round", last_round + 1)
+                record_round(self.algod_client, last_round)
+            except Exception:
+                # Wait-block endpoint unavailable or busy: fall back to a short poll
+                time.sleep(1)
             print(f"Waiting for confirmation... (Round: {last_round})")
-            time.sleep(2)
+        raise Exception(f"Transaction {txid} not confirmed after {max_rounds} rounds")
     
     def deploy_contract(self, approval_program, clear_program, global_schema, local_schema):
         """Deploy smart contract to Algorand TestNet"""
         try:
-            # Get suggested parameters
-            params = self.algod_client.suggested_params()
+            # Get suggested parameters (cached network constants + last seen round)
+            params = cached_suggested_params(self.algod_client)
             
             # Create application transaction
             txn = transaction.ApplicationCreateTxn(
@@ -100,8 +169,8 @@ class ContractDeployer:
     def call_contract(self, app_id, app_args):
         """Call a method on the deployed contract"""
         try:
-            # Get suggested parameters
-            params = self.algod_client.suggested_params()
+            # Get suggested parameters (cached network constants + last seen round)
+            params = cached_suggested_params(self.algod_client)
             
             # Create application call transaction
             txn = transaction.ApplicationCallTxn(
@@ -125,28 +194,83 @@ class ContractDeployer:
         except Exception as e:
             print(f"Error calling contract: {e}")
             raise
+    
+    def call_contracts(self, calls):
+        """Call several contract methods as one atomic group
+        
+        Args:
+            calls: List of (app_id, app_args) pairs, executed in order
+        """
+        try:
+            # One set of suggested parameters covers the whole group
+            params = cached_suggested_params(self.algod_client)
+            
+            txns = [
+                transaction.ApplicationCallTxn(
+                    sender=self.address,
+                    sp=params,
+                    index=app_id,
+                    on_complete=transaction.OnComplete.NoOpOC,
+                    app_args=app_args
+                )
+                for app_id, app_args in calls
+            ]
+            transaction.assign_group_id(txns)
+            
+            # Sign and submit the group; every member lands in the same round
+            signed_txns = [txn.sign(self.private_key) for txn in txns]
+            tx_id = self.algod_client.send_transactions(signed_txns)
+            print(f"Submitted grouped application calls: {tx_id}")
+            
+            # Waiting on one member confirms the whole group
+            tx_response = self.wait_for_confirmation(tx_id)
+            return tx_response
+        except Exception as e:
+            print(f"Error calling contracts: {e}")
+            raise
+
+def rewrite_env(env_path, updates):
+    """Set KEY=value entries in a .env file, keeping other lines in place
+    
+    Each key is substituted in one regex pass over the whole text (appended
+    if missing), and the file is written back with a single write.
+    """
+    env_file = Path(env_path)
+    text = env_file.read_text()
+    for key, value in updates.items():
+        line = f"{key}={value}"
+        text, count = re.subn(rf"^{re.escape(key)}=.*$", lambda _: line, text, flags=re.M)
+        if count == 0:
+            if text and not text.endswith("\n"):
+                text += "\n"
+            text += line + "\n"
+    env_file.write_text(text)
 
 def deploy_registry_and_oracle():
     """Deploy both contracts to TestNet and set up their relationship"""
     deployer = ContractDeployer()
     
-    print("Compiling CompliLedger SBOM Registry contract...")
-    # Read and compile approval program
-    with open("CompliLedger_SbomRegistry_approval.teal", "r") as f:
-        sbom_approval = deployer.compile_program(f.read())
-    
-    # Read and compile clear state program
-    with open("CompliLedger_SbomRegistry_clear.teal", "r") as f:
-        sbom_clear = deployer.compile_program(f.read())
+    print("Compiling CompliLedger SBOM Registry and Compliance Oracle contracts...")
+    teal_files = {
+        "sbom_approval": "CompliLedger_SbomRegistry_approval.teal",
+        "sbom_clear": "CompliLedger_SbomRegistry_clear.teal",
+        "oracle_approval": "CompliLedger_ComplianceOracle_approval.teal",
+        "oracle_clear": "CompliLedger_ComplianceOracle_clear.teal",
+    }
     
-    print("Compiling CompliLedger Compliance Oracle contract...")
-    # Read and compile approval program
-    with open("CompliLedger_ComplianceOracle_approval.teal", "r") as f:
-        oracle_approval = deployer.compile_program(f.read())
+    def read_and_compile(path):
+        with open(path, "r") as f:
+            return deployer.compile_program(f.read())
     
-    # Read and compile clear state program
-    with open("CompliLedger_ComplianceOracle_clear.teal", "r") as f:
-        oracle_clear = deployer.compile_program(f.read())
+    # Each file's read and compile RPC are independent of the others, so run
+    # them as parallel read -> compile pipelines over the pooled client
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(teal_files)) as executor:
+        futures = {name: executor.submit(read_and_compile, path) for name, path in teal_files.items()}
+        programs = {name: future.result() for name, future in futures.items()}
+    sbom_approval = programs["sbom_approval"]
+    sbom_clear = programs["sbom_clear"]
+    oracle_approval = programs["oracle_approval"]
+    oracle_clear = programs["oracle_clear"]
     
     # Define schemas for the contracts
     print("Deploying SBOM Registry contract (box-based)...")
@@ -175,27 +299,15 @@ def deploy_registry_and_oracle():
         oracle_local_schema
     )
     
-    # Link the contracts by setting registry ID in oracle
+    # Link the contracts in one atomic group: registry ID into the oracle,
+    # and the oracle application's address (32-byte public key) into the registry
     print("Linking contracts...")
-    deployer.call_contract(
-        oracle_app_id,
-        [
-            "set_registry".encode(),
-            registry_app_id.to_bytes(8, "big")
-        ]
-    )
-    
-    # Set oracle address in registry to the oracle application's address (32-byte public key)
-    print("Setting oracle address in registry...")
-    oracle_app_addr = get_application_address(oracle_app_id)  # base32 address string
-    oracle_app_pk = algo_encoding.decode_address(oracle_app_addr)  # 32-byte public key
-    deployer.call_contract(
-        registry_app_id,
-        [
-            "set_oracle".encode(),
-            oracle_app_pk
-        ]
-    )
+    # App address public key = SHA-512/256("appID" || uint64 app id); skips the base32 round trip
+    oracle_app_pk = algo_encoding.checksum(b"appID" + oracle_app_id.to_bytes(8, "big"))  # 32-byte public key
+    deployer.call_contracts([
+        (oracle_app_id, ["set_registry".encode(), registry_app_id.to_bytes(8, "big")]),
+        (registry_app_id, [SET_ORACLE, oracle_app_pk]),
+    ])
     
     # Save app IDs to config file
     config = {
@@ -213,22 +325,7 @@ def deploy_registry_and_oracle():
         repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         env_path = os.path.join(repo_root, ".env")
         if os.path.exists(env_path):
-            with open(env_path, "r") as ef:
-                lines = ef.readlines()
-            def upsert(lines, key, value):
-                found = False
-                for i, ln in enumerate(lines):
-                    if ln.startswith(key+"="):
-                        lines[i] = f"{key}={value}\n"
-                        found = True
-                        break
-                if not found:
-                    lines.append(f"{key}={value}\n")
-                return lines
-            lines = upsert(lines, "REGISTRY_APP_ID", str(registry_app_id))
-            lines = upsert(lines, "ORACLE_APP_ID", str(oracle_app_id))
-            with open(env_path, "w") as ef:
-                ef.writelines(lines)
+            rewrite_env(env_path, {"REGISTRY_APP_ID": registry_app_id, "ORACLE_APP_ID": oracle_app_id})
             print(f"Updated .env with new App IDs at {env_path}")
         else:
             print(f".env not found at {env_path}; skipping .env update")
@@ -242,36 +339,76 @@ def deploy_registry_and_oracle():
     
     return registry_app_id, oracle_app_id
 
+def _codegen_is_current(module, teal_files):
+    """Check whether a PyTeal module's TEAL output matches its current source
+    
+    Returns (is_current, stamp_path, digest); write digest to stamp_path
+    after regenerating so the next run can skip the codegen.
+    """
+    digest = hashlib.sha256(inspect.getsource(module).encode()).hexdigest()
+    stamp_path = COMPILE_CACHE_DIR / f"{module.__name__}.sha256"
+    is_current = (
+        stamp_path.exists()
+        and stamp_path.read_text() == digest
+        and all(os.path.exists(name) for name in teal_files)
+    )
+    return is_current, stamp_path, digest
+
+def _record_codegen(stamp_path, digest):
+    """Remember the source digest a module's TEAL was generated from"""
+    try:
+        COMPILE_CACHE_DIR.mkdir(exist_ok=True)
+        stamp_path.write_text(digest)
+    except OSError as e:
+        print(f"Warning: failed to record PyTeal codegen stamp: {e}")
+
+def compile_pyteal_module(module, teal_files, label):
+    """Run module.compile_contract() unless its TEAL already matches the current source
+    
+    Returns True if the TEAL files were regenerated.
+    """
+    is_current, stamp_path, digest = _codegen_is_current(module, teal_files)
+    if is_current:
+        print(f"{label} PyTeal unchanged; reusing existing TEAL")
+        return False
+    module.compile_contract()
+    _record_codegen(stamp_path, digest)
+    return True
+
 def compile_pyteal_to_teal():
     """Compile PyTeal contracts to TEAL files"""
     import sbom_registry
     import compliance_oracle
     
     # Execute the compilation code for each contract
-    # This will create the TEAL files
+    # This will create the TEAL files (skipped when the PyTeal source is unchanged)
     if hasattr(sbom_registry, "compile_contract"):
-        sbom_registry.compile_contract()
+        compile_pyteal_module(
+            sbom_registry,
+            ["CompliLedger_SbomRegistry_approval.teal", "CompliLedger_SbomRegistry_clear.teal"],
+            "SBOM Registry",
+        )
     else:
         # Default compilation if compile_contract doesn't exist
-        with open("sbom_registry_approval.teal", "w") as f:
-            compiled = sbom_registry.compileTeal(sbom_registry.sbom_registry(), sbom_registry.Mode.Application, version=6)
-            f.write(compiled)
+        compiled = sbom_registry.compileTeal(sbom_registry.sbom_registry(), sbom_registry.Mode.Application, version=6)
+        write_if_changed("sbom_registry_approval.teal", compiled)
         
-        with open("sbom_registry_clear.teal", "w") as f:
-            compiled = sbom_registry.compileTeal(sbom_registry.clear_state_program(), sbom_registry.Mode.Application, version=6)
-            f.write(compiled)
+        compiled = sbom_registry.compileTeal(sbom_registry.clear_state_program(), sbom_registry.Mode.Application, version=6)
+        write_if_changed("sbom_registry_clear.teal", compiled)
     
     if hasattr(compliance_oracle, "compile_contract"):
-        compliance_oracle.compile_contract()
+        compile_pyteal_module(
+            compliance_oracle,
+            ["CompliLedger_ComplianceOracle_approval.teal", "CompliLedger_ComplianceOracle_clear.teal"],
+            "Compliance Oracle",
+        )
     else:
         # Default compilation if compile_contract doesn't exist
-        with open("compliance_oracle_approval.teal", "w") as f:
-            compiled = compliance_oracle.compileTeal(compliance_oracle.approval_program(), compliance_oracle.Mode.Application, version=6)
-            f.write(compiled)
+        compiled = compliance_oracle.compileTeal(compliance_oracle.approval_program(), compliance_oracle.Mode.Application, version=6)
+        write_if_changed("compliance_oracle_approval.teal", compiled)
         
-        with open("compliance_oracle_clear.teal", "w") as f:
-            compiled = compliance_oracle.compileTeal(compliance_oracle.clear_state_program(), compliance_oracle.Mode.Application, version=6)
-            f.write(compiled)
+        compiled = compliance_oracle.compileTeal(compliance_oracle.clear_state_program(), compliance_oracle.Mode.Application, version=6)
+        write_if_changed("compliance_oracle_clear.teal", compiled)
 
 if __name__ == "__main__":
     # First, compile the PyTeal contracts to TEAL
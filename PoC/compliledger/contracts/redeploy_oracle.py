@@ -20,14 +20,18 @@ def main():
 
     registry_app_id = int(cfg["registry_app_id"])  # keep existing registry
 
-    # 1) Compile PyTeal to TEAL for oracle
+    # 1) Compile PyTeal to TEAL for oracle (skipped when the source is unchanged)
     print("Compiling Compliance Oracle PyTeal → TEAL...")
-    oracle_mod.compile_contract()
+    deploy_mod.compile_pyteal_module(
+        oracle_mod,
+        ["CompliLedger_ComplianceOracle_approval.teal", "CompliLedger_ComplianceOracle_clear.teal"],
+        "Compliance Oracle",
+    )
 
     # 2) Create deployer
     deployer = deploy_mod.ContractDeployer()
 
-    # 3) Read TEAL and compile to binary
+    # 3) Read TEAL and compile to binary (shares deploy.py's bytecode cache)
     print("Preparing TEAL for oracle deployment...")
     with open("CompliLedger_ComplianceOracle_approval.teal", "r") as f:
         oracle_approval = deployer.compile_program(f.read())
@@ -73,18 +77,7 @@ def main():
         repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         env_path = os.path.join(repo_root, ".env")
         if os.path.exists(env_path):
-            with open(env_path, "r") as ef:
-                lines = ef.readlines()
-            found = False
-            for i, ln in enumerate(lines):
-                if ln.startswith("ORACLE_APP_ID="):
-                    lines[i] = f"ORACLE_APP_ID={new_oracle_app_id}\n"
-                    found = True
-                    break
-            if not found:
-                lines.append(f"ORACLE_APP_ID={new_oracle_app_id}\n")
-            with open(env_path, "w") as ef:
-                ef.writelines(lines)
+            deploy_mod.rewrite_env(env_path, {"ORACLE_APP_ID": new_oracle_app_id})
             print(f"Updated .env with new ORACLE_APP_ID at {env_path}")
         else:
             print(f".env not found at {env_path}; skipping .env update")
@@ -1,12 +1,22 @@
 from pyteal import *
+try:
+    from .teal_files import write_if_changed
+except ImportError:
+    # Run as a script from contracts/
+    from teal_files import write_if_changed
 
 """
 SBOMRegistry Smart Contract
 This contract stores artifact verification records on the Algorand blockchain
 """
 
-# 64 zero bytes constant for padding (computed at import time)
-ZERO64 = Bytes("base16", "0x" + "00" * 64)
+# Method signatures. args[0] carries the ARC-4 style 4-byte selector
+# (first 4 bytes of SHA-512/256 of the signature); the remaining args are
+# passed raw, not ABI-encoded. Keep in sync with compliledger_clients.py.
+SET_ORACLE_SIG = "set_oracle(address)void"
+SUBMIT_VERIFICATION_SIG = "submit_verification(byte[32],byte[])void"
+UPDATE_VERIFICATION_SIG = "update_verification(byte[32],byte[],uint64)void"
+QUERY_VERIFICATION_SIG = "query_verification(byte[32])void"
 
 def sbom_registry():
     """
@@ -21,10 +31,9 @@ def sbom_registry():
     #   8..39   : submitter (32 bytes)
     #   40..47  : submitted_at (uint, Itob)
     #   48..55  : verified_at (uint, Itob)      [0 until verified]
-    #   56..63  : profile_len (uint, Itob)
-    #   64..    : profile_id (bytes)
-    #   ...     : oscal_len (uint, Itob)
-    #   ...     : oscal_cid (bytes)
+    #   56..119 : profile_id (bytes, zero-padded to 64)
+    #   120..183: oscal_cid (bytes, zero-padded to 64; all zero until verified)
+    # Fixed-width fields carry no length prefix: readers strip trailing zero bytes.
 
     # --- Error code constants ---
     ERR_NOT_ADMIN = Bytes("ERR_NOT_ADMIN")
@@ -34,7 +43,6 @@ def sbom_registry():
     ERR_OSCAL_TOO_LONG = Bytes("ERR_OSCAL_TOO_LONG")
     ERR_BOX_EXISTS = Bytes("ERR_BOX_EXISTS")
     ERR_BOX_MISSING = Bytes("ERR_BOX_MISSING")
-    ERR_BOX_CREATE_FAILED = Bytes("ERR_BOX_CREATE_FAILED")
 
     # Handle creation
     handle_creation = Seq([
@@ -55,78 +63,72 @@ def sbom_registry():
     ])
 
     # Submit verification request
-    # Args: [0]"submit_verification", [1]artifact_hash, [2]profile_id
+    # Args: [0]submit_verification selector, [1]artifact_hash, [2]profile_id
     artifact_hash = Txn.application_args[1]
     profile_id = Txn.application_args[2]
     
     # Fixed-size box value layout constants
     PROFILE_MAX = Int(64)
     OSCAL_MAX = Int(64)
-    TOTAL_SIZE = Int(200)  # 8+32+8+8+8 + 64 + 8 + 64 = 200
+    TOTAL_SIZE = Int(184)  # 8+32+8+8 + 64 + 64 = 184
 
     # Build initial packed box value with fixed-size fields
     initial_status = Itob(Int(0))
     submitter_bytes = Txn.sender()
     submitted_at = Itob(Global.latest_timestamp())
     verified_at = Itob(Int(0))
-    profile_len_u64 = Len(profile_id)
-    profile_len = Itob(profile_len_u64)
-    profile_pad_len = PROFILE_MAX - profile_len_u64
-    profile_padded = Concat(profile_id, Substring(ZERO64, Int(0), profile_pad_len))
-    oscal_zero_field = Concat(Itob(Int(0)), Substring(ZERO64, Int(0), OSCAL_MAX))
+    # Profile length is read by both the size check and the padding; compute it once
+    pid_len = ScratchVar(TealType.uint64)
+    profile_pad_len = PROFILE_MAX - pid_len.load()
+    profile_padded = Concat(profile_id, BytesZero(profile_pad_len))
+    oscal_zero_field = BytesZero(OSCAL_MAX)
 
     packed_initial = Concat(
         initial_status,              # 0..7
         submitter_bytes,             # 8..39 (32 bytes)
         submitted_at,                # 40..47
         verified_at,                 # 48..55
-        profile_len,                 # 56..63
-        profile_padded,              # 64..127 (64 bytes fixed)
-        oscal_zero_field             # 128..199 (8 + 64)
+        profile_padded,              # 56..119 (64 bytes fixed)
+        oscal_zero_field             # 120..183 (64 bytes fixed)
     )
 
-    # Pre-checks for submit: artifact key length, profile length, duplicate box
-    mv_pre = BoxGet(artifact_hash)
+    # Pre-checks for submit: artifact key length, profile length.
+    # BoxCreate returns 0 for an existing box, which doubles as the duplicate check.
+    created = ScratchVar(TealType.uint64)
     submit_verification = Seq([
-        If(Or(Len(artifact_hash) != Int(32), Len(artifact_hash) == Int(0))).Then(Seq([
+        If(Len(artifact_hash) != Int(32)).Then(Seq([
             Log(ERR_BAD_ARTIFACT_KEY),
             Return(Int(0))
         ])),
-        If(Len(profile_id) > PROFILE_MAX).Then(Seq([
+        pid_len.store(Len(profile_id)),
+        If(pid_len.load() > PROFILE_MAX).Then(Seq([
             Log(ERR_PROFILE_TOO_LONG),
             Return(Int(0))
         ])),
-        mv_pre,
-        If(mv_pre.hasValue()).Then(Seq([
+        created.store(BoxCreate(artifact_hash, TOTAL_SIZE)),
+        If(created.load() == Int(0)).Then(Seq([
             Log(ERR_BOX_EXISTS),
             Return(Int(0))
         ])),
-        If(BoxCreate(artifact_hash, TOTAL_SIZE)).Then(Seq([
-            BoxPut(artifact_hash, packed_initial),
-            Return(Int(1))
-        ])).Else(Seq([
-            Log(ERR_BOX_CREATE_FAILED),
-            Return(Int(0))
-        ]))
+        BoxPut(artifact_hash, packed_initial),
+        Return(Int(1))
     ])
     
     # Update verification from oracle
-    # Args: [0]"update_verification", [1]artifact_hash, [2]oscal_cid, [3]status(int)
+    # Args: [0]update_verification selector, [1]artifact_hash, [2]oscal_cid, [3]status(int)
     is_oracle = Txn.sender() == App.globalGet(Bytes("oracle_address"))
     oscal_cid = Txn.application_args[2]
     verification_status = Btoi(Txn.application_args[3])
     
-    # Offsets in the packed layout (with reserved OSCAL field space of 8+64 bytes)
+    # Offsets in the packed layout (with reserved OSCAL field space of 64 bytes)
     STATUS_OFF = Int(0)
     SUBMITTER_OFF = Int(8)
     SUBMITTED_AT_OFF = Int(40)
     VERIFIED_AT_OFF = Int(48)
-    PROFILE_LEN_OFF = Int(56)
-    PROFILE_ID_OFF = Int(64)
+    PROFILE_ID_OFF = Int(56)
+    OSCAL_CID_OFF = Int(120)
 
     mv = BoxGet(artifact_hash)
-    profile_len_loaded = ScratchVar(TealType.uint64)
-    oscal_off = ScratchVar(TealType.uint64)
     cid_field = ScratchVar(TealType.bytes)
     cid_pad_len = ScratchVar(TealType.uint64)
 
@@ -149,16 +151,14 @@ def sbom_registry():
         # Update verified_at in place
         BoxReplace(artifact_hash, VERIFIED_AT_OFF, Itob(Global.latest_timestamp())),
         # Compute and write OSCAL field
-        profile_len_loaded.store(Btoi(Extract(mv.value(), PROFILE_LEN_OFF, Int(8)))),
-        oscal_off.store(Int(128)),
         cid_pad_len.store(OSCAL_MAX - Len(oscal_cid)),
-        cid_field.store(Concat(Itob(Len(oscal_cid)), Concat(oscal_cid, Substring(ZERO64, Int(0), cid_pad_len.load())))),
-        BoxReplace(artifact_hash, oscal_off.load(), cid_field.load()),
+        cid_field.store(Concat(oscal_cid, BytesZero(cid_pad_len.load()))),
+        BoxReplace(artifact_hash, OSCAL_CID_OFF, cid_field.load()),
         Return(Int(1))
     ])
     
     # Query verification status
-    # Args: [0]"query_verification", [1]artifact_hash
+    # Args: [0]query_verification selector, [1]artifact_hash
     # Log the status (first 8 bytes) from the box; if box missing, log 0
     mvq = BoxGet(artifact_hash)
     query_verification = Seq([
@@ -176,13 +176,13 @@ def sbom_registry():
         )
     ])
     
-    # Program logic
+    # Program logic: dispatch on 4-byte method selectors
     program = Cond(
         [Txn.application_id() == Int(0), handle_creation],
-        [Txn.application_args[0] == Bytes("set_oracle"), set_oracle],
-        [Txn.application_args[0] == Bytes("submit_verification"), submit_verification],
-        [Txn.application_args[0] == Bytes("update_verification"), update_verification],
-        [Txn.application_args[0] == Bytes("query_verification"), query_verification]
+        [Txn.application_args[0] == MethodSignature(SET_ORACLE_SIG), set_oracle],
+        [Txn.application_args[0] == MethodSignature(SUBMIT_VERIFICATION_SIG), submit_verification],
+        [Txn.application_args[0] == MethodSignature(UPDATE_VERIFICATION_SIG), update_verification],
+        [Txn.application_args[0] == MethodSignature(QUERY_VERIFICATION_SIG), query_verification]
     )
     
     return program
@@ -196,14 +196,12 @@ def clear_state_program():
 def compile_contract():
     """Compile the contract to TEAL files"""
     # Compile the approval program
-    with open("CompliLedger_SbomRegistry_approval.teal", "w") as f:
-        compiled = compileTeal(sbom_registry(), Mode.Application, version=8)
-        f.write(compiled)
+    compiled = compileTeal(sbom_registry(), Mode.Application, version=8)
+    write_if_changed("CompliLedger_SbomRegistry_approval.teal", compiled)
     
     # Compile the clear state program
-    with open("CompliLedger_SbomRegistry_clear.teal", "w") as f:
-        compiled = compileTeal(clear_state_program(), Mode.Application, version=8)
-        f.write(compiled)
+    compiled = compileTeal(clear_state_program(), Mode.Application, version=8)
+    write_if_changed("CompliLedger_SbomRegistry_clear.teal", compiled)
     
     print("CompliLedger SBOM Registry contract compiled to TEAL (v8)")
 
@@ -0,0 +1,18 @@
+"""File helpers shared by the PyTeal contract modules and deploy.py"""
+
+
+def write_if_changed(path, data):
+    """Write text to path unless the file already holds exactly that text
+    
+    Leaving unchanged TEAL untouched keeps its mtime stable for build tools.
+    Returns True if the file was written.
+    """
+    try:
+        with open(path, "r") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "w") as f:
+        f.write(data)
+    return True
@@ -0,0 +1,254 @@
+"""
+Shared fixtures for the CompliLedger integration test scripts
+"""
+
+import copy
+import hashlib
+import functools
+
+import orjson
+
+
+def create_sample_sbom(serial_number=None, ecosystem="pypi"):
+    """Create a realistic sample SBOM for testing
+    
+    ecosystem picks the component set: "pypi" (the backend's own Python
+    dependencies) or "npm" (lodash/axios/react with a dependency graph).
+    Each call returns an independent copy; passing serial_number (e.g. a
+    fresh urn:uuid) replaces the template's serial.
+    """
+    sbom = copy.deepcopy(_SBOM_TEMPLATES[ecosystem]())
+    if serial_number is not None:
+        sbom["serialNumber"] = serial_number
+    return sbom
+
+
+@functools.lru_cache(maxsize=None)
+def sample_sbom_hash(ecosystem="pypi"):
+    """SHA-256 of a fixed sample SBOM's JSON encoding (computed once per ecosystem)"""
+    return hashlib.sha256(orjson.dumps(_SBOM_TEMPLATES[ecosystem]())).hexdigest()
+
+
+class LazyJson:
+    """Log argument that serializes obj (indented) only when the record is emitted
+    
+    Use as logger.info("%s", LazyJson(obj)): if INFO is filtered out the
+    dump never runs. limit truncates the rendered text to that many characters.
+    """
+    
+    def __init__(self, obj, limit=None):
+        self.obj = obj
+        self.limit = limit
+    
+    def __str__(self):
+        text = orjson.dumps(self.obj, option=orjson.OPT_INDENT_2, default=str).decode()
+        if self.limit is not None and len(text) > self.limit:
+            return text[:self.limit] + "..."
+        return text
+
+
+@functools.lru_cache(maxsize=1)
+def _pypi_sbom():
+    # CycloneDX format SBOM
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "serialNumber": "urn:uuid:ed50646c-6afc-4d3e-8f24-fa17cad66aa1",
+        "version": 1,
+        "metadata": {
+            "timestamp": "2023-06-09T10:30:15Z",
+            "tools": [
+                {
+                    "vendor": "CompliLedger",
+                    "name": "SBOM Generator",
+                    "version": "1.0.0"
+                }
+            ],
+            "authors": [
+                {
+                    "name": "CompliLedger Test Suite",
+                    "email": "test@compliledger.com"
+                }
+            ],
+            "component": {
+                "type": "application",
+                "bom-ref": "pkg:compliledger/test-app@1.0.0",
+                "name": "Test Application",
+                "version": "1.0.0"
+            }
+        },
+        "components": [
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/algorand-sdk@2.0.0",
+                "name": "algorand-sdk",
+                "version": "2.0.0",
+                "purl": "pkg:pypi/algorand-sdk@2.0.0",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/fastapi@0.95.2",
+                "name": "fastapi",
+                "version": "0.95.2",
+                "purl": "pkg:pypi/fastapi@0.95.2",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/ipfs-api@0.7.0",
+                "name": "ipfs-api",
+                "version": "0.7.0",
+                "purl": "pkg:pypi/ipfs-api@0.7.0",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/pydantic@1.10.8",
+                "name": "pydantic",
+                "version": "1.10.8",
+                "purl": "pkg:pypi/pydantic@1.10.8",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/pyteal@0.20.1",
+                "name": "pyteal",
+                "version": "0.20.1",
+                "purl": "pkg:pypi/pyteal@0.20.1",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/sqlalchemy@2.0.15",
+                "name": "sqlalchemy", 
+                "version": "2.0.15",
+                "purl": "pkg:pypi/sqlalchemy@2.0.15",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "MIT"
+                        }
+                    }
+                ]
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:pypi/google-generativeai@0.2.0",
+                "name": "google-generativeai",
+                "version": "0.2.0",
+                "purl": "pkg:pypi/google-generativeai@0.2.0",
+                "licenses": [
+                    {
+                        "license": {
+                            "id": "Apache-2.0"
+                        }
+                    }
+                ]
+            }
+        ]
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _npm_sbom():
+    # CycloneDX format SBOM
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "serialNumber": "urn:uuid:3e671687-395b-41f5-a30f-a58921a69b79",
+        "version": 1,
+        "metadata": {
+            "timestamp": "2023-10-15T08:30:00Z",
+            "tools": [
+                {
+                    "vendor": "CompliLedger",
+                    "name": "SBOM Generator",
+                    "version": "1.0.0"
+                }
+            ],
+            "authors": [
+                {
+                    "name": "CompliLedger Team",
+                    "email": "team@compliledger.com"
+                }
+            ]
+        },
+        "components": [
+            {
+                "type": "library",
+                "bom-ref": "pkg:npm/lodash@4.17.21",
+                "name": "lodash",
+                "version": "4.17.21",
+                "purl": "pkg:npm/lodash@4.17.21",
+                "description": "Lodash modular utilities."
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:npm/axios@0.27.2",
+                "name": "axios",
+                "version": "0.27.2",
+                "purl": "pkg:npm/axios@0.27.2",
+                "description": "Promise based HTTP client for the browser and node.js"
+            },
+            {
+                "type": "library",
+                "bom-ref": "pkg:npm/react@18.2.0",
+                "name": "react",
+                "version": "18.2.0",
+                "purl": "pkg:npm/react@18.2.0",
+                "description": "React is a JavaScript library for building user interfaces."
+            }
+        ],
+        "dependencies": [
+            {
+                "ref": "pkg:npm/lodash@4.17.21",
+                "dependsOn": []
+            },
+            {
+                "ref": "pkg:npm/axios@0.27.2",
+                "dependsOn": []
+            },
+            {
+                "ref": "pkg:npm/react@18.2.0",
+                "dependsOn": []
+            }
+        ]
+    }
+
+
+# Shared, never-mutated templates; create_sample_sbom hands out deep copies
+_SBOM_TEMPLATES = {
+    "pypi": _pypi_sbom,
+    "npm": _npm_sbom,
+}
@@ -10,12 +10,9 @@ This test:
 """
 
 import os
-import sys
-import json
 import asyncio
 import logging
-import hashlib
-from pathlib import Path
+import functools
 
 # Configure logging
 logging.basicConfig(
@@ -24,21 +21,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Add parent directories to path to ensure imports work
-PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-sys.path.append(str(PROJECT_ROOT))
-sys.path.append(str(PROJECT_ROOT / "backend"))
-sys.path.append(str(PROJECT_ROOT / "contracts"))
+# Services come from the installed package (`pip install -e .` in PoC/)
+from compliledger.backend.app.services.ai_service import AIService, AnalysisLevel
+from compliledger.backend.app.services.ipfs_service import IPFSService
+from compliledger.contracts.contract_integration import ContractIntegrationService
 
-# Import required services
-try:
-    from backend.app.services.ai_service import AIService, AnalysisLevel
-    from backend.app.services.ipfs_service import IPFSService
-    from contracts.contract_integration import ContractIntegrationService
-    logger.info("Successfully imported required services")
-except ImportError as e:
-    logger.error(f"Import error: {e}")
-    sys.exit(1)
+from _fixtures import LazyJson, create_sample_sbom, sample_sbom_hash
+
+# Services are built lazily (constructors read env/config) and shared across the run
+@functools.lru_cache(maxsize=1)
+def get_ai_service():
+    """Return the run-wide AIService (built on first use)"""
+    return AIService()
+
+@functools.lru_cache(maxsize=1)
+def get_ipfs_service():
+    """Return the run-wide IPFSService (built on first use; needs Pinata env)"""
+    return IPFSService()
+
+@functools.lru_cache(maxsize=1)
+def get_contract_service():
+    """Return the run-wide ContractIntegrationService (built on first use)"""
+    return ContractIntegrationService()
 
 async def test_e2e_flow():
     """
@@ -53,53 +57,48 @@ async def test_e2e_flow():
     # Step 1: Create a sample SBOM
     logger.info("Step 1: Creating sample SBOM")
     sample_sbom = create_sample_sbom()
-    sbom_hash = hashlib.sha256(json.dumps(sample_sbom).encode()).hexdigest()
-    logger.info(f"Created sample SBOM with hash: {sbom_hash}")
-    print("\n=== Sample SBOM ===")
-    print(json.dumps(sample_sbom, indent=2)[:500] + "...\n")
+    sbom_hash = sample_sbom_hash()
+    logger.info("Created sample SBOM with hash: %s", sbom_hash)
+    logger.info("=== Sample SBOM ===\n%s", LazyJson(sample_sbom, limit=500))
     
     # Step 2: Run AI analysis
     logger.info("Step 2: Running AI analysis")
-    ai_service = AIService()
+    ai_service = get_ai_service()
     try:
         logger.info("Analyzing SBOM with Gemini 2.5 Flash")
         analysis_results = await ai_service.analyze_sbom(sample_sbom, level=AnalysisLevel.STANDARD)
-        logger.info(f"AI analysis complete with score: {analysis_results.get('overall_score', 'N/A')}")
-        print("\n=== AI Analysis Results ===")
-        print(json.dumps({k: v for k, v in analysis_results.items() 
-                         if k not in ['findings']}, indent=2))
-        print(f"Findings: {len(analysis_results.get('findings', []))} items\n")
+        logger.info("AI analysis complete with score: %s", analysis_results.get('overall_score', 'N/A'))
+        logger.info(
+            "=== AI Analysis Results ===\n%s\nFindings: %s items",
+            LazyJson({k: v for k, v in analysis_results.items() if k not in ['findings']}),
+            len(analysis_results.get('findings', [])),
+        )
     except Exception as e:
-        logger.error(f"AI analysis failed: {str(e)}")
+        logger.error("AI analysis failed: %s", e)
         analysis_results = {"error": str(e), "overall_score": 0}
     
+    # Steps 3 and 4 overlap: on-chain registration keys on the SBOM hash alone,
+    # so the IPFS upload runs while the blockchain integration confirms
     # Step 3: Store on IPFS
     logger.info("Step 3: Storing on IPFS")
-    ipfs_service = IPFSService()
-    try:
-        sbom_with_analysis = {
-            "sbom": sample_sbom,
-            "analysis": analysis_results
-        }
-        # Provide required arguments: name and artifact_hash
-        pin_result = await ipfs_service.pin_json(
-            data=sbom_with_analysis,
-            name=f"sbom-verification-{sbom_hash[:8]}",
-            artifact_hash=sbom_hash
-        )
-        cid = pin_result.get("ipfs_cid")
-        ipfs_url = pin_result.get("ipfs_url")
-        logger.info(f"Stored on IPFS with CID: {cid}")
-        logger.info(f"IPFS Gateway URL: {ipfs_url}")
-    except Exception as e:
-        logger.error(f"IPFS storage failed: {str(e)}")
-        cid = None
+    ipfs_service = get_ipfs_service()
+    sbom_with_analysis = {
+        "sbom": sample_sbom,
+        "analysis": analysis_results
+    }
+    # Provide required arguments: name and artifact_hash
+    pin_task = asyncio.create_task(ipfs_service.pin_json(
+        data=sbom_with_analysis,
+        name=f"sbom-verification-{sbom_hash[:8]}",
+        artifact_hash=sbom_hash
+    ))
     
     # Step 4: Process through blockchain integration
     logger.info("Step 4: Processing through blockchain integration")
-    contract_service = ContractIntegrationService()
+    contract_service = get_contract_service()
     
-    # Create artifact data for blockchain
+    # Create artifact data for blockchain (the pipeline pins its own OSCAL
+    # documents, so it does not need the CID from step 3)
     artifact_data = {
         "name": "Test SBOM E2E",
         "description": "End-to-End Test SBOM",
@@ -109,7 +108,6 @@ async def test_e2e_flow():
         "components": sample_sbom.get("components", []),
         "analysis_results": {
             "compliance_score": analysis_results.get("overall_score", 0),
-            "ipfs_cid": cid if cid else "mock_cid_placeholder",
             "findings_count": len(analysis_results.get("findings", [])),
             "controls_passed": len([f for f in analysis_results.get("findings", []) 
                                    if f.get("status") == "pass"]),
@@ -118,14 +116,28 @@ async def test_e2e_flow():
         }
     }
     
-    try:
-        blockchain_result = await contract_service.process_artifact(artifact_data)
-        logger.info(f"Blockchain integration complete with status: {blockchain_result.get('status', 'unknown')}")
-        print("\n=== Blockchain Integration Results ===")
-        print(json.dumps(blockchain_result, indent=2))
-    except Exception as e:
-        logger.error(f"Blockchain integration failed: {str(e)}")
-        blockchain_result = {"status": "error", "error": str(e)}
+    pin_outcome, blockchain_outcome = await asyncio.gather(
+        pin_task,
+        contract_service.process_artifact(artifact_data),
+        return_exceptions=True
+    )
+    
+    if isinstance(pin_outcome, Exception):
+        logger.error("IPFS storage failed: %s", pin_outcome)
+        cid = None
+    else:
+        cid = pin_outcome.get("ipfs_cid")
+        ipfs_url = pin_outcome.get("ipfs_url")
+        logger.info("Stored on IPFS with CID: %s", cid)
+        logger.info("IPFS Gateway URL: %s", ipfs_url)
+    
+    if isinstance(blockchain_outcome, Exception):
+        logger.error("Blockchain integration failed: %s", blockchain_outcome)
+        blockchain_result = {"status": "error", "error": str(blockchain_outcome)}
+    else:
+        blockchain_result = blockchain_outcome
+        logger.info("Blockchain integration complete with status: %s", blockchain_result.get('status', 'unknown'))
+        logger.info("=== Blockchain Integration Results ===\n%s", LazyJson(blockchain_result))
     
     # Final status and summary
     logger.info("=======================================")
@@ -153,137 +165,5 @@ async def test_e2e_flow():
         "oracle_app_id": blockchain_result.get("oracle_app_id", 0),
     }
 
-def create_sample_sbom():
-    """Create a realistic sample SBOM for testing"""
-    # CycloneDX format SBOM
-    return {
-        "bomFormat": "CycloneDX",
-        "specVersion": "1.4",
-        "serialNumber": "urn:uuid:ed50646c-6afc-4d3e-8f24-fa17cad66aa1",
-        "version": 1,
-        "metadata": {
-            "timestamp": "2023-06-09T10:30:15Z",
-            "tools": [
-                {
-                    "vendor": "CompliLedger",
-                    "name": "SBOM Generator",
-                    "version": "1.0.0"
-                }
-            ],
-            "authors": [
-                {
-                    "name": "CompliLedger Test Suite",
-                    "email": "test@compliledger.com"
-                }
-            ],
-            "component": {
-                "type": "application",
-                "bom-ref": "pkg:compliledger/test-app@1.0.0",
-                "name": "Test Application",
-                "version": "1.0.0"
-            }
-        },
-        "components": [
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/algorand-sdk@2.0.0",
-                "name": "algorand-sdk",
-                "version": "2.0.0",
-                "purl": "pkg:pypi/algorand-sdk@2.0.0",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/fastapi@0.95.2",
-                "name": "fastapi",
-                "version": "0.95.2",
-                "purl": "pkg:pypi/fastapi@0.95.2",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/ipfs-api@0.7.0",
-                "name": "ipfs-api",
-                "version": "0.7.0",
-                "purl": "pkg:pypi/ipfs-api@0.7.0",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/pydantic@1.10.8",
-                "name": "pydantic",
-                "version": "1.10.8",
-                "purl": "pkg:pypi/pydantic@1.10.8",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/pyteal@0.20.1",
-                "name": "pyteal",
-                "version": "0.20.1",
-                "purl": "pkg:pypi/pyteal@0.20.1",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/sqlalchemy@2.0.15",
-                "name": "sqlalchemy", 
-                "version": "2.0.15",
-                "purl": "pkg:pypi/sqlalchemy@2.0.15",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "MIT"
-                        }
-                    }
-                ]
-            },
-            {
-                "type": "library",
-                "bom-ref": "pkg:pypi/google-generativeai@0.2.0",
-                "name": "google-generativeai",
-                "version": "0.2.0",
-                "purl": "pkg:pypi/google-generativeai@0.2.0",
-                "licenses": [
-                    {
-                        "license": {
-                            "id": "Apache-2.0"
-                        }
-                    }
-                ]
-            }
-        ]
-    }
-
 if __name__ == "__main__":
     asyncio.run(test_e2e_flow())